@@ -1,14 +1,23 @@
 # app/config.py
-# from pydantic_settings import BaseSettings
+import os
 
 
-# class Settings(BaseSettings):
-#     ALLOWED_ORIGINS: list = ["http://localhost:5173"]
-#     UPLOAD_DIR: str = "./uploads"
-#     STATIC_DIR: str = "./static"
+class Settings:
+    ALLOWED_ORIGINS: list = ["http://localhost:5173"]
+    UPLOAD_DIR: str = "./uploads"
+    STATIC_DIR: str = "./static"
 
-#     class Config:
-#         env_file = ".env"
+    # Matrix sessions (see app/services/matrix_store.py)
+    MATRIX_CACHE_SIZE: int = int(os.getenv("MATRIX_CACHE_SIZE", "32"))
+    MATRIX_SESSION_LIMIT: int = int(os.getenv("MATRIX_SESSION_LIMIT", "256"))
+    MATRIX_SESSION_TTL: float = float(os.getenv("MATRIX_SESSION_TTL", "3600"))
+    MATRIX_SPILL_DIR: str | None = os.getenv("MATRIX_SPILL_DIR") or None
 
+    # Compute pools (see app/services/executor.py)
+    COMPUTE_THREADS: int = int(os.getenv("COMPUTE_THREADS", str(os.cpu_count() or 4)))
+    COMPUTE_PROCESSES: int = int(os.getenv("COMPUTE_PROCESSES", "2"))
+    COMPUTE_QUEUE_DEPTH: int = int(os.getenv("COMPUTE_QUEUE_DEPTH", "16"))
+    COMPUTE_TIMEOUT: float = float(os.getenv("COMPUTE_TIMEOUT", "60"))
 
-# settings = Settings()
+
+settings = Settings()
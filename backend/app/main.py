@@ -5,6 +5,7 @@ from app.routes import (
     visualization,
     ivpbvp,
 )  # Import the new visualization router
+from app.services.executor import compute_executor
 
 app = FastAPI(title="Advanced Matrix Operations API", version="1.1.0")
 
@@ -26,6 +27,11 @@ app.include_router(
 app.include_router(ivpbvp.router, prefix="/api/v1/ivpbvp", tags=["ivpbvp"])
 
 
+@app.on_event("shutdown")
+async def shutdown_compute_pools():
+    compute_executor.shutdown()
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Advanced Matrix Operations API!"}
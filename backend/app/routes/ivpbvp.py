@@ -1,5 +1,7 @@
 import numpy as np
-from scipy.optimize import root_scalar
+
+from app.services.couette_sweep import couette_sweep
+from app.services.ode_solver import compile_rhs, integrate_ode
 
 
 # Problem parameters
@@ -18,151 +20,6 @@ y_vals = np.linspace(0, L, N)
 def analytical_solution(P, y, L, U0):
     return (-P / (2 * mu) * y**2) + (P * y / (2 * mu) + U0 * y / L)
 
-import numpy as np
-
-def explicit_euler(y0, v0, step_size, y_end, P):
-    n_steps = int(y_end / step_size) + 1
-    y_values = []
-    u_values = []
-
-    # Initialize values
-    y = 0
-    u = y0
-    v = v0
-
-    for _ in range(n_steps):
-        y_values.append(y)
-        u_values.append(u)
-
-        # Update using Explicit Euler method
-        u_new = u + step_size * v
-        v_new = v - step_size * P
-
-        # Update the values
-        u = u_new
-        v = v_new
-        y += step_size
-
-    return y_values, u_values
-
-
-def explicit_euler_ivp(y_range, u0, u0_prime, P, mu, dy):
-    """Improved explicit Euler method using central difference"""
-    N = len(y_range)
-    u = np.zeros(N)
-    u_prime = np.zeros(N)
-    
-    # Initial conditions
-    u[0] = u0
-    u_prime[0] = u0_prime
-    
-    # First point using forward Euler
-    u[1] = u[0] + dy * u0_prime
-    u_prime[1] = u_prime[0] + dy * (-P/mu)
-    
-    # Remaining points using central difference
-    for i in range(2, N):
-        u_prime[i] = u_prime[i-1] + dy * (-P/mu)
-        u[i] = 2*u[i-1] - u[i-2] + (dy**2 * (-P/mu))
-    
-    return u
-
-def implicit_euler(y0, v0, step_size, y_end, P):
-
-    n_steps = int(y_end / step_size) + 1
-    y_values = []
-    u_values = []
-
-    # Initialize values
-    y = 0
-    u = y0
-    v = v0
-
-    for _ in range(n_steps):
-        y_values.append(y)
-        u_values.append(u)
-
-        # Implicit Euler update
-        # Solve for v_next first
-        v_next = v - step_size * P
-        # Use v_next to update u_next
-        u_next = u + step_size * v_next
-
-        # Update values
-        u = u_next
-        v = v_next
-        y += step_size
-
-    return y_values, u_values
-
-def implicit_euler_ivp(y_range, u0, u0_prime, P, mu, dy):
-    # Use explicit_euler for integration
-    y_end = y_range[-1] - y_range[0]  # Total range in y
-    y_values, u_values = explicit_euler(u0, u0_prime, dy, y_end, P / mu)
-
-    # Convert results to arrays
-    u = np.array(u_values)
-    return u
-    N = len(y_range)
-    u = np.zeros(N)
-    u_prime = np.zeros(N)
-    u[0] = u0
-    u_prime[0] = u0_prime
-
-    for i in range(1, N):
-        # Iterative step for implicit Euler
-        u_prime[i] = u_prime[i - 1] + dy * (-P / mu)
-        u[i] = u[i - 1] + dy * u_prime[i]
-
-    return u
-
-
-# Shooting method to adjust initial slope to satisfy boundary conditions
-def shooting_method(P, mu, L, U0, dy, method="explicit"):
-    def boundary_condition_shooting(guess):
-        # Choose the solver based on the method argument
-        if method == "explicit":
-            u_vals = explicit_euler_ivp(y_vals, 0, guess, P, mu, dy)
-        elif method == "implicit":
-            u_vals = implicit_euler_ivp(y_vals, 0, guess, P, mu, dy)
-
-        # Evaluate solution at y = L
-        u_L = u_vals[-1]
-        return u_L - U0  # Difference from the desired boundary condition u(L) = U0
-
-    # Find the correct initial slope using a root-finding method
-    res = root_scalar(boundary_condition_shooting, bracket=[-10, 10], method="brentq")
-    initial_slope = res.root
-
-    # Solve the IVP with the found initial slope using the specified method
-    if method == "explicit":
-        u_solution = explicit_euler_ivp(y_vals, 0, initial_slope, P, mu, dy)
-    elif method == "implicit":
-        u_solution = implicit_euler_ivp(y_vals, 0, initial_slope, P, mu, dy)
-
-    return u_solution
-
-
-def finite_difference(P, mu, dy, N, U0):
-    A = np.zeros((N, N))
-    b = np.zeros(N)
-
-    # Fill matrix A for interior points
-    for i in range(1, N - 1):
-        A[i, i - 1] = 1 / dy**2
-        A[i, i] = -2 / dy**2
-        A[i, i + 1] = 1 / dy**2
-        b[i] = -P / mu
-
-    # Boundary conditions
-    A[0, 0] = 1  # u(0) = 0
-    A[-1, -1] = 1
-    b[-1] = U0  # u(L) = U0
-
-    # Solve the system
-    u = np.linalg.solve(A, b)
-    return u
-
 
 #
 def system_equations(u, v, P):
@@ -200,35 +57,37 @@ def compute_jacobian(u, v, P, delta=1e-5):
 
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 
-router = APIRouter()
-
+from app.services.executor import compute_executor
 
-def compute_solution(p_value: float, N: int, mu=1.0, L=1.0, U0=1.0, dy=0.01):
-    y = np.linspace(0, 1, N)
-
-    u_shooting_explicit = shooting_method(p_value, mu, L, U0, dy, method="explicit")
-    u_shooting_implicit = shooting_method(p_value, mu, L, U0, dy, method="implicit")
+router = APIRouter()
 
-    u_fd = finite_difference(p_value, mu, dy, N, U0)
-    u_analytical = analytical_solution(p_value, y, L, U0)
+# Upper limit on attempted steps for a single /ode request
+MAX_ODE_STEPS = 1000000
 
-    result = []
 
-    for i in range(len(y)):
-        result.append(
-            {
-                "p_value": p_value,
-                "y": y[i],
-                "explicit_euler": u_shooting_explicit[i],
-                "implicit_euler": u_shooting_implicit[i],
-                "finite_difference": u_fd[i],
-                "analytical_solution": u_analytical[i],
-            }
+def _solution_points(sweep, P_values):
+    # One list of per-point dicts for each P, the response format of /solve
+    y = sweep["y"].tolist()
+    methods = (
+        "explicit_euler",
+        "implicit_euler",
+        "finite_difference",
+        "analytical_solution",
+    )
+    solutions = []
+    for j, p in enumerate(P_values):
+        columns = [sweep[method][j].tolist() for method in methods]
+        solutions.append(
+            [
+                {"p_value": p, "y": y_i, **dict(zip(methods, values))}
+                for y_i, *values in zip(y, *columns)
+            ]
         )
-    return result
+    return solutions
 
 
 @router.post("/solve")
@@ -245,14 +104,24 @@ async def compute_solutions(data: dict):
         return {
             "error": "Invalid stepsize. It must be positive and less than or equal to the domain length."
         }
-    # Compute the number of grid points
-    N = int(L / stepsize)
-
-    solutions = []
-    for p in P_values:
-        solution = compute_solution(p, N, mu, L, U0, stepsize)
-        solutions.append(solution)
-    return {"solutions": solutions}
+    if not isinstance(P_values, list) or not all(
+        isinstance(p, (int, float)) and not isinstance(p, bool) and np.isfinite(p)
+        for p in P_values
+    ):
+        return {"error": "P_values must be a list of finite numbers."}
+    if not P_values:
+        return {"solutions": []}
+
+    # All P values in one pass: batched shooting, one banded FD solve
+    try:
+        sweep = await compute_executor.run_in_thread(
+            couette_sweep, P_values, stepsize, mu, L, U0
+        )
+    except ValueError as ve:
+        return {"error": str(ve)}
+    solutions = _solution_points(sweep, P_values)
+    # Plain lists of floats already; skip jsonable_encoder's walk over every point
+    return JSONResponse({"solutions": solutions})
 
 
 @router.post("/jacobian")
@@ -275,3 +144,61 @@ async def compute_jacobian_matrix(data: dict):
     J = compute_jacobian(u, v, P, delta)
 
     return {"jacobian": J.tolist()}
+
+
+@router.post("/ode")
+async def solve_ode_system(data: dict):
+    """
+    Integrate a user-defined first-order system with adaptive step size control.
+
+    Parameters:
+        data: JSON payload with
+            - `equations`: right-hand sides as expressions, e.g. ["v", "-P / mu"].
+            - `variables`: state variable names in the same order, e.g. ["u", "v"].
+            - `initial_conditions`: initial values of the variables.
+            - `t_span`: [t0, t_end].
+            - optional `parameters` (e.g. {"P": 2, "mu": 1}), `method` ("dopri5",
+              or "rosenbrock" for stiff systems), `rtol`, `atol` and `max_steps`.
+
+    Returns:
+        The accepted time points, the solution per variable and step statistics.
+    """
+    try:
+        variables = data["variables"]
+        rhs = compile_rhs(data["equations"], variables, data.get("parameters"))
+        y0 = data["initial_conditions"]
+        if len(y0) != len(variables):
+            raise ValueError("Give one initial condition per variable")
+        max_steps = int(data.get("max_steps", 100000))
+        if not 1 <= max_steps <= MAX_ODE_STEPS:
+            raise ValueError(f"max_steps must be between 1 and {MAX_ODE_STEPS}")
+
+        result = await compute_executor.run_in_thread(
+            integrate_ode,
+            rhs,
+            data["t_span"],
+            y0,
+            data.get("method", "dopri5"),
+            float(data.get("rtol", 1e-6)),
+            float(data.get("atol", 1e-9)),
+            max_steps,
+        )
+    except KeyError as ke:
+        return {"error": f"Missing field: {ke.args[0]}"}
+    except (TypeError, ValueError) as ve:
+        return {"error": str(ve)}
+    except OverflowError:
+        return {"error": "Numbers must be within the float64 range"}
+
+    return {
+        "t": result["t"].tolist(),
+        "solution": {
+            name: result["y"][:, i].tolist() for i, name in enumerate(variables)
+        },
+        "method": data.get("method", "dopri5"),
+        "success": result["success"],
+        "message": result["message"],
+        "function_evaluations": result["nfev"],
+        "accepted_steps": result["accepted"],
+        "rejected_steps": result["rejected"],
+    }
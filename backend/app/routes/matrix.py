@@ -1,37 +1,98 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request
 from fastapi.responses import JSONResponse
+from app.config import settings
+from app.services.batched_solver import solve_batched
+from app.services.charpoly import SLOW_METHOD_LIMIT, SLOW_METHODS
+from app.services.executor import compute_executor
+from app.services.krylov import krylov_solve
 from app.services.matrix_solver import AccurateMatrixSolver as MatrixSolver
+from app.services.matrix_solver import power_method as power_iteration
+from app.services.matrix_store import MatrixStore
+from app.services.sparse_solver import SparseMatrixSolver
 from app.utils.file_handler import (
     read_csv_matrix,
-    save_matrix_to_file,
-    read_matrix_from_file,
+    read_binary_matrix,
+    read_rhs_matrix,
+    read_sparse_matrix,
+    read_stacked_systems,
 )
-import os
+from typing import Optional
+import asyncio
 import numpy as np
 import logging
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Path where matrices are stored
-MATRIX_FILE_PATH = "uploaded_matrix.csv"
-VECTOR_B1_FILE_PATH = "vector_b1.csv"
-VECTOR_B2_FILE_PATH = "vector_b2.csv"
-
+# Uploaded matrices live in memory, one session per upload
+matrix_store = MatrixStore(
+    max_entries=settings.MATRIX_CACHE_SIZE,
+    max_sessions=settings.MATRIX_SESSION_LIMIT,
+    ttl=settings.MATRIX_SESSION_TTL,
+    spill_dir=settings.MATRIX_SPILL_DIR,
+)
 
-def get_matrix_solver():
-    if not os.path.exists(MATRIX_FILE_PATH):
-        raise HTTPException(status_code=400, detail="Please upload a matrix first")
 
-    try:
-        matrix_A = read_matrix_from_file(MATRIX_FILE_PATH)
-        vector_b1 = read_matrix_from_file(VECTOR_B1_FILE_PATH)
-        vector_b2 = read_matrix_from_file(VECTOR_B2_FILE_PATH)
-    except Exception as e:
-        logger.error(f"Error reading matrix files: {str(e)}")
-        raise HTTPException(status_code=500, detail="Error reading matrix files")
+def get_matrix_solver(matrix_id: Optional[str] = None):
+    """
+    Resolve the solver for the matrix ID returned by an upload. There is no fallback
+    to another client's upload: requests without an ID are rejected.
+    """
+    if matrix_id is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Missing matrix_id: upload a matrix first and pass its matrix_id",
+        )
 
-    return MatrixSolver(np.array(matrix_A), np.array(vector_b1), np.array(vector_b2))
+    solver = matrix_store.get(matrix_id)
+    if solver is None:
+        raise HTTPException(
+            status_code=404, detail=f"Unknown or expired matrix_id: {matrix_id}"
+        )
+    return solver
+
+
+def _json_number(value):
+    """
+    Convert a NumPy scalar to JSON: complex values become {"real", "imag"} and
+    non-finite values become "Infinity", "-Infinity" or "NaN".
+    """
+    if isinstance(value, complex):
+        if value.imag != 0:
+            return {"real": _json_number(value.real), "imag": _json_number(value.imag)}
+        value = value.real
+    if np.isnan(value):
+        return "NaN"
+    if np.isinf(value):
+        return "Infinity" if value > 0 else "-Infinity"
+    return float(value)
+
+
+def _eigenvalues_json(eigenvalues):
+    """
+    Convert eigenvalues to the JSON format shared by every endpoint: plain numbers
+    for a real spectrum, {"real", "imag"} for every entry of a complex one.
+    """
+    eigenvalues = np.asarray(eigenvalues)
+    if np.iscomplexobj(eigenvalues):
+        return [
+            {"real": _json_number(e.real), "imag": _json_number(e.imag)}
+            for e in eigenvalues
+        ]
+    return [_json_number(e) for e in eigenvalues]
+
+
+def _create_session(matrix_A, vector_b1, vector_b2):
+    """
+    Hash the upload, open its session (possibly spilling another matrix to disk) and
+    detect its structure, which picks the solve and eigen routines for the matrix.
+    Run in a worker thread, off the event loop.
+
+    Returns:
+    - (matrix_id, structure report)
+    """
+    matrix_id = matrix_store.create_session(matrix_A, vector_b1, vector_b2)
+    return matrix_id, matrix_store.get(matrix_id).structure_report()
 
 
 @router.post("/upload/")
@@ -39,18 +100,25 @@ async def upload_matrix(file: UploadFile = File(...)):
     try:
         matrix_data = await read_csv_matrix(file)
 
-        save_matrix_to_file(matrix_data["matrix_A"], MATRIX_FILE_PATH)
-        save_matrix_to_file(matrix_data["vector_b1"], VECTOR_B1_FILE_PATH)
-        save_matrix_to_file(matrix_data["vector_b2"], VECTOR_B2_FILE_PATH)
+        matrix_id, structure = await compute_executor.run_in_thread(
+            _create_session,
+            matrix_data["matrix_A"],
+            matrix_data["vector_b1"],
+            matrix_data["vector_b2"],
+        )
 
         return {
             "message": "Matrix and vectors uploaded successfully",
+            "matrix_id": matrix_id,
+            "structure": structure,
             "data": {
                 "matrix_A": matrix_data["matrix_A"].tolist(),
                 "vector_b1": matrix_data["vector_b1"].tolist(),
                 "vector_b2": matrix_data["vector_b2"].tolist(),
             },
         }
+    except HTTPException:
+        raise
     except ValueError as ve:
         logger.error(f"Invalid matrix format: {str(ve)}")
         return {"OOPS!!": str(ve)}
@@ -59,24 +127,127 @@ async def upload_matrix(file: UploadFile = File(...)):
         return {"OOPS!!": f"Error saving matrix: {str(e)}"}
 
 
-@router.get("/eigenvalues/")
-async def get_eigenvalues(solver: MatrixSolver = Depends(get_matrix_solver)):
+@router.post("/upload-binary/")
+async def upload_binary_matrix(
+    file: UploadFile = File(...), format: Optional[str] = None
+):
+    """
+    Upload A, b1 and b2 as one (n + 2) x n float array, either as a .npy file or as
+    raw little-endian float64 values preceded by a (rows, cols) uint64 header.
+    """
     try:
-        eigenvalues = solver.eigenvalues_via_lu()
-
-        # Prepare eigenvalues in a JSON-compatible format
-        eigenvalues_list = []
-        for eigenvalue in eigenvalues:
-            if isinstance(eigenvalue, complex):
-                # If it's a complex number, return a dict with real and imaginary parts
-                eigenvalues_list.append(
-                    {"real": eigenvalue.real, "imag": eigenvalue.imag}
+        # The mmap read and the finiteness scan touch every byte of the upload
+        matrix_data = await compute_executor.run_in_thread(
+            read_binary_matrix, file, format
+        )
+
+        matrix_id, structure = await compute_executor.run_in_thread(
+            _create_session,
+            matrix_data["matrix_A"],
+            matrix_data["vector_b1"],
+            matrix_data["vector_b2"],
+        )
+
+        return {
+            "message": "Matrix and vectors uploaded successfully",
+            "matrix_id": matrix_id,
+            "shape": list(matrix_data["matrix_A"].shape),
+            "structure": structure,
+        }
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        logger.error(f"Invalid binary matrix format: {str(ve)}")
+        return {"OOPS!!": str(ve)}
+    except Exception as e:
+        logger.error(f"Error uploading binary matrix: {str(e)}")
+        return {"OOPS!!": f"Error saving matrix: {str(e)}"}
+
+
+@router.post("/upload-sparse/")
+async def upload_sparse_matrix(
+    file: UploadFile = File(...),
+    rhs: Optional[UploadFile] = File(None),
+    format: Optional[str] = None,
+):
+    """
+    Upload a sparse matrix as Matrix Market (.mtx) or as a "row,col,value" triplet
+    CSV. It is stored in CSR format and later requests are served by sparse solvers.
+    The optional rhs file (.npy or CSV) holds b1 and b2 as two rows.
+    """
+    try:
+        matrix_A = await read_sparse_matrix(file, format)
+
+        vector_b1 = vector_b2 = None
+        if rhs is not None:
+            B = await read_rhs_matrix(rhs)
+            if B.shape != (2, matrix_A.shape[0]):
+                raise ValueError(
+                    f"The rhs file must hold b1 and b2 as 2 rows of length "
+                    f"{matrix_A.shape[0]}, got shape {B.shape}"
                 )
-            else:
-                # If it's a real number, append it as is
-                eigenvalues_list.append(eigenvalue)
+            vector_b1, vector_b2 = B
+
+        matrix_id, structure = await compute_executor.run_in_thread(
+            _create_session, matrix_A, vector_b1, vector_b2
+        )
 
-        return {"eigenvalues": eigenvalues_list}
+        return {
+            "message": "Sparse matrix uploaded successfully",
+            "matrix_id": matrix_id,
+            "shape": list(matrix_A.shape),
+            "nnz": int(matrix_A.nnz),
+            "structure": structure,
+        }
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        logger.error(f"Invalid sparse matrix format: {str(ve)}")
+        return {"OOPS!!": str(ve)}
+    except Exception as e:
+        logger.error(f"Error uploading sparse matrix: {str(e)}")
+        return {"OOPS!!": f"Error saving matrix: {str(e)}"}
+
+
+@router.get("/structure/")
+async def get_structure(solver: MatrixSolver = Depends(get_matrix_solver)):
+    """
+    The detected structure of the matrix (symmetry, definiteness, bandwidth,
+    triangularity) and the routines used for solves, eigenvalues and the
+    condition number.
+    """
+    try:
+        return await compute_executor.run_in_thread(solver.structure_report)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error detecting matrix structure: {str(e)}")
+        return {"OOPS!!": "Unexpected error detecting matrix structure"}
+
+
+@router.get("/eigenvalues/")
+async def get_eigenvalues(
+    k: int = 6, solver: MatrixSolver = Depends(get_matrix_solver)
+):
+    """
+    All eigenvalues of a dense matrix. For sparse matrices only the k largest in
+    magnitude are computed, with 1 <= k < n - 1.
+    """
+    try:
+        if isinstance(solver, SparseMatrixSolver):
+            if not 1 <= k < solver.n - 1:
+                raise ValueError(f"k must be between 1 and {solver.n - 2}")
+            eigenvalues = await compute_executor.run_in_thread(solver.eigenvalues, k)
+        else:
+            eigenvalues = await compute_executor.run_in_thread(
+                solver.eigenvalues_via_lu
+            )
+
+        return {"eigenvalues": _eigenvalues_json(eigenvalues)}
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        return {"OOPS!!": str(ve)}
     except np.linalg.LinAlgError as lae:
         logger.error(f"Linear algebra error calculating eigenvalues: {str(lae)}")
         return {
@@ -90,9 +261,21 @@ async def get_eigenvalues(solver: MatrixSolver = Depends(get_matrix_solver)):
 @router.get("/determinant/")
 async def get_determinant(solver: MatrixSolver = Depends(get_matrix_solver)):
     try:
-        determinant = solver.determinant()
-        is_unique = "unique" if abs(determinant) > 1e-10 else "not unique"
-        return {"determinant": float(determinant), "uniqness": is_unique}
+        determinant, (sign, log_abs_determinant), rank = (
+            await compute_executor.run_in_thread(
+                lambda: (solver.determinant(), solver.log_determinant(), solver.rank())
+            )
+        )
+        is_unique = "unique" if rank == solver.n else "not unique"
+        return {
+            "determinant": _json_number(determinant),
+            "sign": sign,
+            "log_abs_determinant": _json_number(log_abs_determinant),
+            "rank": rank,
+            "uniqness": is_unique,
+        }
+    except HTTPException:
+        raise
     except np.linalg.LinAlgError as lae:
         logger.error(f"Linear algebra error calculating determinant: {str(lae)}")
         return {
@@ -104,10 +287,21 @@ async def get_determinant(solver: MatrixSolver = Depends(get_matrix_solver)):
 
 
 @router.get("/condition-number/")
-async def get_condition_number(solver: MatrixSolver = Depends(get_matrix_solver)):
+async def get_condition_number(
+    method: str = "estimate", solver: MatrixSolver = Depends(get_matrix_solver)
+):
+    """
+    Condition number of the matrix next to that of the Hilbert matrix of the same
+    size. method=estimate (default) is the O(n^2) 1-norm estimate from the cached
+    factors; method=exact is the 2-norm condition number from an SVD. Both
+    numbers are in the norm reported as "norm".
+    """
     try:
-        condition_number = solver.condition_number_via_eigenvalues()
-        hilbert_condition = solver.compare_with_hilbert()[1]
+        if method not in ("estimate", "exact"):
+            raise ValueError("Invalid method. Must be 'estimate' or 'exact'.")
+        condition_number, hilbert_condition = await compute_executor.run_in_thread(
+            solver.compare_with_hilbert, method
+        )
 
         matrix_condition = (
             "Infinity" if np.isinf(condition_number) else float(condition_number)
@@ -119,7 +313,13 @@ async def get_condition_number(solver: MatrixSolver = Depends(get_matrix_solver)
         return {
             "matrix_condition": matrix_condition,
             "hilbert_condition": hilbert_condition_str,
+            "method": method,
+            "norm": "1" if method == "estimate" else "2",
         }
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        return {"OOPS!!": str(ve)}
     except np.linalg.LinAlgError as lae:
         logger.error(f"Linear algebra error calculating condition number: {str(lae)}")
         return {
@@ -131,11 +331,39 @@ async def get_condition_number(solver: MatrixSolver = Depends(get_matrix_solver)
 
 
 @router.get("/polynomial-equation/")
-async def get_polynomial_equation(solver: MatrixSolver = Depends(get_matrix_solver)):
+async def get_polynomial_equation(
+    method: str = "auto",
+    dps: int = 50,
+    solver: MatrixSolver = Depends(get_matrix_solver),
+):
+    """
+    Characteristic polynomial det(xI - A), highest degree first. method=auto is
+    exact for small integer matrices and uses the Hessenberg form otherwise;
+    exact and mpmath also return the coefficients as decimal strings. The O(n^4)
+    methods (berkowitz, faddeev, exact, mpmath) are refused with a 400 above
+    SLOW_METHOD_LIMIT rows.
+    """
     try:
-        coefficients = solver.polynomial_equation()
-        print(coefficients)
-        return {"coefficients": coefficients.tolist()}
+        if method in SLOW_METHODS and solver.n > SLOW_METHOD_LIMIT:
+            raise HTTPException(
+                status_code=400,
+                detail=f"method={method} is limited to {SLOW_METHOD_LIMIT}x"
+                f"{SLOW_METHOD_LIMIT} matrices; use method=hessenberg",
+            )
+        if not 15 <= dps <= 1000:
+            raise ValueError("dps must be between 15 and 1000")
+        result = await compute_executor.run_in_thread(
+            solver.polynomial_equation, method, dps
+        )
+        return {
+            "coefficients": [_json_number(c) for c in result["coefficients"]],
+            "exact_coefficients": result["exact_coefficients"],
+            "method": result["method"],
+        }
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        return {"OOPS!!": str(ve)}
     except np.linalg.LinAlgError as lae:
         logger.error(
             f"Linear algebra error calculating polynomial equation: {str(lae)}"
@@ -151,30 +379,38 @@ async def get_polynomial_equation(solver: MatrixSolver = Depends(get_matrix_solv
 @router.get("/power-method/")
 async def power_method(solver: MatrixSolver = Depends(get_matrix_solver)):
     try:
-        largest_eigenvalue_A = solver.power_method()
-        largest_eigenvalue_inverse_A = solver.power_method(inverse=True)
-        lu_eigenvalues = solver.eigenvalues_via_lu()
-
-        # Prepare eigenvalues in a JSON-compatible format
-        eigenvalues_list = []
-        for eigenvalue in lu_eigenvalues:
-            if isinstance(eigenvalue, complex):
-                # If it's a complex number, return a dict with real and imaginary parts
-                eigenvalues_list.append(
-                    {"real": eigenvalue.real, "imag": eigenvalue.imag}
+        if isinstance(solver, SparseMatrixSolver):
+            # ARPACK and sparse LU release the GIL, so threads are enough
+            largest_eigenvalue_A, largest_eigenvalue_inverse_A, lu_eigenvalues = (
+                await asyncio.gather(
+                    compute_executor.run_in_thread(solver.power_method),
+                    compute_executor.run_in_thread(solver.power_method, True),
+                    compute_executor.run_in_thread(
+                        solver.eigenvalues, min(6, solver.n - 2)
+                    ),
+                )
+            )
+            largest_eigenvalue_A = _json_number(largest_eigenvalue_A)
+        else:
+            # The power iterations are pure-Python loops, so they run in worker processes
+            largest_eigenvalue_A, largest_eigenvalue_inverse_A, lu_eigenvalues = (
+                await asyncio.gather(
+                    compute_executor.run_in_process(power_iteration, solver.A),
+                    compute_executor.run_in_process(power_iteration, solver.A, True),
+                    compute_executor.run_in_thread(solver.eigenvalues_via_lu),
                 )
-            else:
-                # If it's a real number, append it as is
-                eigenvalues_list.append(eigenvalue)
+            )
 
         return {
             "largest_eigenvalue_A": largest_eigenvalue_A,
             "largest_eigenvalue_inverse_A": largest_eigenvalue_inverse_A,
-            "lu_eigenvalues": eigenvalues_list,
+            "lu_eigenvalues": _eigenvalues_json(lu_eigenvalues),
         }
+    except HTTPException:
+        raise
     except np.linalg.LinAlgError as lae:
         logger.error(f"Linear algebra error in power method: {str(lae)}")
-        if solver.determinant() == 0:
+        if solver.is_singular():
             return {
                 "error": "Power method failed. The matrix is singular.",
                 "largest_eigenvalue_A": 0 ,
@@ -188,15 +424,147 @@ async def power_method(solver: MatrixSolver = Depends(get_matrix_solver)):
         return {"error": f"Unexpected error in power method: {str(e)}"}
 
 
+@router.get("/inverse-iteration/")
+async def inverse_iteration(
+    shift: float = 0.0,
+    rayleigh: bool = False,
+    max_iterations: int = 1000,
+    tol: float = 1e-10,
+    solver: MatrixSolver = Depends(get_matrix_solver),
+):
+    """
+    Eigenvalue closest to `shift` by shifted inverse iteration, factoring
+    A - shift * I once. rayleigh=true switches to Rayleigh quotient iteration.
+    """
+    try:
+        result = await compute_executor.run_in_thread(
+            solver.inverse_iteration, shift, rayleigh, max_iterations, tol
+        )
+        return {
+            "eigenvalue": _json_number(result["eigenvalue"]),
+            "eigenvector": result["eigenvector"].tolist(),
+            "iterations": result["iterations"],
+            "converged": result["converged"],
+        }
+    except HTTPException:
+        raise
+    except np.linalg.LinAlgError as lae:
+        logger.error(f"Linear algebra error in inverse iteration: {str(lae)}")
+        return {
+            "OOPS!!": "Inverse iteration failed. The shifted matrix may be singular."
+        }
+    except Exception as e:
+        logger.error(f"Unexpected error in inverse iteration: {str(e)}")
+        return {"OOPS!!": "Unexpected error in inverse iteration"}
+
+
+@router.get("/top-eigenvalues/")
+async def top_eigenvalues(
+    k: int = 3,
+    method: Optional[str] = None,
+    warm_start_from: Optional[str] = None,
+    solver: MatrixSolver = Depends(get_matrix_solver),
+):
+    """
+    The k largest-magnitude eigenpairs by block subspace iteration or Arnoldi
+    (the default is subspace for dense symmetric matrices and arnoldi otherwise).
+    As for /eigenvalues/, sparse matrices need 1 <= k < n - 1.
+    Unconverged results are reported as errors, never returned as eigenpairs.
+    warm_start_from names another matrix_id whose last top-k subspace seeds the
+    iteration; otherwise this matrix's own previous result is reused.
+    """
+    try:
+        if isinstance(solver, SparseMatrixSolver):
+            # Sparse matrices default to ARPACK, which needs k < n - 1
+            if not 1 <= k < solver.n - 1:
+                raise ValueError(f"k must be between 1 and {solver.n - 2}")
+        elif not 1 <= k <= solver.n:
+            raise ValueError(f"k must be between 1 and {solver.n}")
+
+        X0 = None
+        if warm_start_from is not None:
+            source = matrix_store.get(warm_start_from)
+            if source is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Unknown or expired matrix_id: {warm_start_from}",
+                )
+            X0 = source.top_basis()
+
+        result = await compute_executor.run_in_thread(
+            solver.top_eigenpairs, k, method, X0
+        )
+        if not result["converged"]:
+            raise ValueError(
+                f"{result['method']} iteration did not converge in "
+                f"{result['iterations']} iterations; try method=arnoldi"
+            )
+        eigenvectors = result["eigenvectors"]
+        return {
+            "eigenvalues": [_json_number(e) for e in result["eigenvalues"]],
+            "eigenvectors": (
+                None if np.iscomplexobj(eigenvectors) else eigenvectors.T.tolist()
+            ),
+            "iterations": result.get("iterations"),
+            "converged": result["converged"],
+            "method": result["method"],
+        }
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        return {"OOPS!!": str(ve)}
+    except Exception as e:
+        logger.error(f"Error computing top eigenvalues: {str(e)}")
+        return {"OOPS!!": f"Unexpected error computing top eigenvalues: {str(e)}"}
+
+
+def _krylov_json(results):
+    return {
+        "method": results[0]["method"],
+        "converged": [r["converged"] for r in results],
+        "iterations": [r["iterations"] for r in results],
+        "residual_history": [r["residual_history"] for r in results],
+    }
+
+
 @router.post("/solve/{vector_choice}")
 async def solve_system(
-    vector_choice: str, solver: MatrixSolver = Depends(get_matrix_solver)
+    vector_choice: str,
+    method: Optional[str] = None,
+    preconditioner: Optional[str] = None,
+    tol: float = 1e-8,
+    maxiter: Optional[int] = None,
+    omega: float = 1.0,
+    solver: MatrixSolver = Depends(get_matrix_solver),
 ):
+    """
+    Solve Ax = b1 or Ax = b2. By default with the cached direct factorization;
+    method=cg|gmres|bicgstab|auto switches to an iterative Krylov solve with an
+    optional jacobi|ilu|ssor preconditioner, stopping at relative residual tol.
+    """
     try:
         if vector_choice not in ["b1", "b2"]:
             raise ValueError("Invalid vector_choice. Must be 'b1' or 'b2'.")
 
-        solution = solver.solve_multiple_b()
+        if method is not None:
+            b = solver.b1 if vector_choice == "b1" else solver.b2
+            if b is None:
+                raise ValueError(
+                    "No right-hand side vectors were uploaded with this matrix"
+                )
+            results = await compute_executor.run_in_thread(
+                krylov_solve, solver.A, b, method, preconditioner, tol, maxiter, omega
+            )
+            result = results[0]
+            return {
+                "solution": result["solution"].tolist(),
+                "method": result["method"],
+                "converged": result["converged"],
+                "iterations": result["iterations"],
+                "residual_history": result["residual_history"],
+            }
+
+        solution = await compute_executor.run_in_thread(solver.solve_multiple_b)
         result = solution[f"Ax = {vector_choice}"]
 
         if result["type"] == "unique solution":
@@ -206,6 +574,8 @@ async def solve_system(
         elif result["type"] == "no solutions":
             return {"OOPS!!": "No solution exists for the given system."}
 
+    except HTTPException:
+        raise
     except ValueError as ve:
         return {"OOPS!!": str(ve)}
     except np.linalg.LinAlgError as lae:
@@ -216,49 +586,139 @@ async def solve_system(
         return {"OOPS!!": "Unexpected error solving the system"}
 
 
+@router.post("/solve-batch/")
+async def solve_batch(
+    request: Request,
+    method: Optional[str] = None,
+    preconditioner: Optional[str] = None,
+    tol: float = 1e-8,
+    maxiter: Optional[int] = None,
+    omega: float = 1.0,
+    solver: MatrixSolver = Depends(get_matrix_solver),
+):
+    """
+    Solve AX = B for many right-hand sides in one blocked solve.
+
+    B holds one right-hand side per row and is sent either as JSON ({"B": [[...], ...]})
+    or as a multipart upload named "file" containing a .npy or CSV array.
+    The Krylov options are the same as for /solve/; the preconditioner is built
+    once for all right-hand sides.
+    """
+    try:
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            form = await request.form()
+            if "file" not in form:
+                raise ValueError("Missing multipart field 'file'")
+            B = await read_rhs_matrix(form["file"])
+        else:
+            payload = await request.json()
+            B = np.asarray(payload["B"], dtype=float)
+            if B.ndim == 1:
+                B = B.reshape(1, -1)
+
+        if method is not None:
+            results = await compute_executor.run_in_thread(
+                krylov_solve, solver.A, B.T, method, preconditioner, tol, maxiter, omega
+            )
+            X = np.column_stack([r["solution"] for r in results])
+            return {
+                "solutions": X.T.tolist(),
+                "residual_norms": np.linalg.norm(solver.A @ X - B.T, axis=0).tolist(),
+                **_krylov_json(results),
+            }
+
+        X, residual_norms = await compute_executor.run_in_thread(solver.solve_many, B.T)
+        return {
+            "solutions": X.T.tolist(),
+            "residual_norms": residual_norms.tolist(),
+        }
+
+    except HTTPException:
+        raise
+    except (ValueError, KeyError) as ve:
+        return {"OOPS!!": f"Invalid right-hand sides: {str(ve)}"}
+    except np.linalg.LinAlgError as lae:
+        logger.error(f"Linear algebra error in batch solve: {str(lae)}")
+        return {"OOPS!!": "Failed to solve the systems. The matrix is singular."}
+    except Exception as e:
+        logger.error(f"Error in batch solve: {str(e)}")
+        return {"OOPS!!": "Unexpected error solving the systems"}
+
+
+@router.post("/solve-stacked/")
+async def solve_stacked(request: Request):
+    """
+    Solve many independent small systems A[i] X[i] = B[i] in one call.
+
+    The systems are sent as JSON ({"A": (batch, n, n), "B": (batch, n, k) or (batch, n)})
+    or as a multipart upload named "file" containing an .npz with arrays "A" and "B".
+    Singular systems are flagged and get null solutions.
+    """
+    try:
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            form = await request.form()
+            if "file" not in form:
+                raise ValueError("Missing multipart field 'file'")
+            A, B = await read_stacked_systems(form["file"])
+        else:
+            payload = await request.json()
+            A = np.asarray(payload["A"], dtype=float)
+            B = np.asarray(payload["B"], dtype=float)
+
+        X, singular, rcond = await compute_executor.run_in_thread(solve_batched, A, B)
+        return {
+            "solutions": [
+                None if flag else x.tolist() for x, flag in zip(X, singular)
+            ],
+            "singular": singular.tolist(),
+            "rcond": rcond.tolist(),
+        }
+
+    except HTTPException:
+        raise
+    except (ValueError, KeyError) as ve:
+        return {"OOPS!!": f"Invalid systems: {str(ve)}"}
+    except Exception as e:
+        logger.error(f"Error in stacked solve: {str(e)}")
+        return {"OOPS!!": "Unexpected error solving the systems"}
+
+
+def _solution_json(solution):
+    if isinstance(solution, str):
+        return {"OOPS!!": f"The system has {solution}."}
+    return solution.tolist()
+
+
 @router.get("/process-all/")
 async def process_all(solver: MatrixSolver = Depends(get_matrix_solver)):
     try:
-        # Collect results from individual operations
-        eigenvalues = await get_eigenvalues(solver)
-        determinant = await get_determinant(solver)
-        condition_numbers = await get_condition_number(solver)
-        polynomial_coeffs = await get_polynomial_equation(solver)
-        power_method_results = await power_method(solver)
-        print(power_method_results)
-
-        # Solutions for both vectors
-        solution_b1 = await solve_system("b1", solver)
-        solution_b2 = await solve_system("b2", solver)
-
-        # Construct the final response
-        combined_response = {
-            "eigenvalues": eigenvalues["eigenvalues"],
-            "determinant": determinant["determinant"],
-            "is_unique": determinant.get(
-                "uniqness"
-            ),  # Assuming is_unique can be derived from determinant
-            "condition_number": condition_numbers["matrix_condition"],
-            "hilbert_condition": condition_numbers["hilbert_condition"],
-            "polynomial_coefficients": polynomial_coeffs["coefficients"],
-            "largest_eigenvalue_A": power_method_results["largest_eigenvalue_A"],
-            "largest_eigenvalue_inverse_A": power_method_results[
-                "largest_eigenvalue_inverse_A"
+        # One LU and one eigendecomposition feed every result below
+        results = await compute_executor.run_in_thread(solver.analysis)
+
+        polynomial_coefficients = results["polynomial_coefficients"]
+        if np.iscomplexobj(polynomial_coefficients):
+            polynomial_coefficients = polynomial_coefficients.real
+
+        return {
+            "eigenvalues": _eigenvalues_json(results["eigenvalues"]),
+            "determinant": _json_number(results["determinant"]),
+            "is_unique": "unique" if results["is_unique"] else "not unique",
+            "condition_number": _json_number(results["condition_number"]),
+            "condition_norm": results["condition_norm"],
+            "hilbert_condition": _json_number(results["hilbert_condition"]),
+            "polynomial_coefficients": [
+                _json_number(c) for c in polynomial_coefficients
             ],
-            "solution_b1": (
-                solution_b1.get("solution")
-                if "solution" in solution_b1
-                else solution_b1
-            ),
-            "solution_b2": (
-                solution_b2.get("solution")
-                if "solution" in solution_b2
-                else solution_b2
+            "largest_eigenvalue_A": _json_number(results["largest_eigenvalue_A"]),
+            "largest_eigenvalue_inverse_A": _json_number(
+                results["largest_eigenvalue_inverse_A"]
             ),
+            "solution_b1": _solution_json(results["solution_b1"]),
+            "solution_b2": _solution_json(results["solution_b2"]),
         }
-        print(combined_response)
-        return combined_response
 
+    except HTTPException:
+        raise
     except np.linalg.LinAlgError as lae:
         logger.error(f"Linear algebra error processing all operations: {str(lae)}")
         return {
@@ -0,0 +1,85 @@
+import numpy as np
+
+from app.services import lu_factors
+from app.services.charpoly import characteristic_polynomial
+from app.services.hilbert_reference import hilbert_condition
+
+
+def analyze_matrix(A, b1, b2, lu_piv=None, eigenvalues=None, condition_number=None):
+    """
+    Compute everything process-all reports from one LU factorization and one
+    eigenvalue decomposition.
+
+    The LU factors give the determinant, uniqueness and both solves; the
+    eigenvalues give the dominant eigenvalues of A and of its inverse. The
+    condition number is the O(n^2) 1-norm estimate from the same LU factors
+    (LAPACK gecon), and the Hilbert reference is taken in the 1-norm to match.
+    The characteristic polynomial comes from
+    charpoly (exact for small integer matrices, the Hessenberg recurrence
+    otherwise).
+
+    Args:
+    - A: Square coefficient matrix.
+    - b1, b2: Right-hand side vectors.
+    - lu_piv: Existing factors from lu_factors.factor, computed here if omitted.
+    - eigenvalues: Existing eigenvalues of A (e.g. from a symmetric or banded
+      eigensolver), computed here if omitted.
+    - condition_number: Existing 1-norm condition estimate of A (e.g. from a
+      Cholesky factor), estimated from the LU factors if omitted.
+
+    Returns:
+    - dict of NumPy results, see the keys below. "condition_number" and
+      "hilbert_condition" are both 1-norm values, as "condition_norm" records.
+    """
+    n = len(A)
+
+    if lu_piv is None:
+        lu_piv = lu_factors.factor(A)
+
+    sign, log_abs_determinant = lu_factors.slogdet(lu_piv)
+    determinant = lu_factors.determinant(lu_piv)
+    rank = lu_factors.rank(lu_piv)
+    is_unique = rank == n
+
+    if condition_number is None:
+        condition_number = lu_factors.condition_estimate(lu_piv, np.linalg.norm(A, 1))
+
+    if eigenvalues is None:
+        eigenvalues = np.linalg.eigvals(A)
+    magnitudes = np.abs(eigenvalues)
+    polynomial_coefficients = characteristic_polynomial(A)["coefficients"]
+
+    largest_eigenvalue_A = eigenvalues[np.argmax(magnitudes)]
+    smallest = eigenvalues[np.argmin(magnitudes)]
+    # The dominant eigenvalue of A^-1 is 1 / (smallest eigenvalue of A)
+    largest_eigenvalue_inverse_A = 1.0 / smallest if is_unique else 0.0
+
+    solutions = {}
+    if is_unique:
+        x = lu_factors.solve(lu_piv, np.column_stack((b1, b2)))
+        solutions = {"b1": x[:, 0], "b2": x[:, 1]}
+    else:
+        rank_A = np.linalg.matrix_rank(A)
+        for name, b in (("b1", b1), ("b2", b2)):
+            rank_aug_A = np.linalg.matrix_rank(np.column_stack((A, b)))
+            solutions[name] = (
+                "infinite solutions" if rank_A == rank_aug_A else "no solutions"
+            )
+
+    return {
+        "lu_piv": lu_piv,
+        "eigenvalues": eigenvalues,
+        "determinant": determinant,
+        "determinant_sign": sign,
+        "log_abs_determinant": log_abs_determinant,
+        "rank": rank,
+        "is_unique": is_unique,
+        "condition_number": condition_number,
+        "condition_norm": "1",
+        "hilbert_condition": hilbert_condition(n, "1"),
+        "polynomial_coefficients": polynomial_coefficients,
+        "largest_eigenvalue_A": largest_eigenvalue_A,
+        "largest_eigenvalue_inverse_A": largest_eigenvalue_inverse_A,
+        "solution_b1": solutions["b1"],
+        "solution_b2": solutions["b2"],
+    }
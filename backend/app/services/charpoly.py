@@ -0,0 +1,241 @@
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from scipy.linalg import hessenberg
+
+try:
+    import mpmath
+except ImportError:  # Only the "mpmath" method needs it
+    mpmath = None
+
+METHODS = (
+    "auto",
+    "hessenberg",
+    "berkowitz",
+    "faddeev",
+    "exact",
+    "mpmath",
+    "eigenvalues",
+)
+# Integer matrices up to this size get exact coefficients with method="auto"
+EXACT_LIMIT = 20
+# The O(n^4) methods (pure Python for all but faddeev) are refused above this size
+SLOW_METHODS = ("berkowitz", "faddeev", "exact", "mpmath")
+SLOW_METHOD_LIMIT = 64
+CACHE_SIZE = 64
+
+_cache = OrderedDict()  # (matrix hash, method, dps) -> result
+_cache_lock = threading.Lock()
+
+
+def hessenberg_charpoly(A):
+    """
+    Characteristic polynomial from the upper Hessenberg form H = Q^T A Q.
+
+    The leading principal minors p_k(x) = det(xI - H[:k, :k]) satisfy
+    p_k = (x - h_kk) p_(k-1) - sum_i h_ik (h_(i+1,i) ... h_(k,k-1)) p_(i-1),
+    so after the O(n^3) orthogonal reduction all coefficients follow from
+    O(n^3) vectorized work without ever computing eigenvalues.
+
+    Returns:
+    - Coefficients, highest degree first (as np.poly).
+    """
+    n = len(A)
+    H = hessenberg(np.asarray(A, dtype=float))
+    sub = np.diag(H, -1)
+    # P[k] holds p_k with the coefficient of x^j at index j
+    P = np.zeros((n + 1, n + 1))
+    P[0, 0] = 1.0
+    with np.errstate(over="ignore", invalid="ignore"):
+        for k in range(1, n + 1):
+            p = np.zeros(n + 1)
+            p[1 : k + 1] = P[k - 1, :k]
+            p -= H[k - 1, k - 1] * P[k - 1]
+            if k > 1:
+                # products h_(i,i-1) ... h_(k-1,k-2) for i = 1 .. k-1 (0-based rows)
+                products = np.cumprod(sub[: k - 1][::-1])[::-1]
+                p -= (H[: k - 1, k - 1] * products) @ P[: k - 1]
+            P[k] = p
+    return P[n, ::-1].copy()
+
+
+def _berkowitz(A):
+    # Division-free, so it stays exact for Python ints and precise for mpf entries
+    p = [1]
+    for k in range(len(A)):
+        M = [row[:k] for row in A[:k]]
+        R = A[k][:k]
+        v = [A[i][k] for i in range(k)]
+        t = [1, -A[k][k]]
+        for _ in range(k):
+            t.append(-sum(r * c for r, c in zip(R, v)))
+            v = [sum(a * c for a, c in zip(row, v)) for row in M]
+        # p_k = T p_(k-1) with T the lower triangular Toeplitz matrix of t
+        p = [
+            sum(t[i - j] * p[j] for j in range(max(0, i - len(t) + 1), min(i, k) + 1))
+            for i in range(k + 2)
+        ]
+    return p
+
+
+def berkowitz_charpoly(A):
+    """
+    Characteristic polynomial by Berkowitz's algorithm in float64, O(n^4).
+    """
+    return np.array(_berkowitz(np.asarray(A, dtype=float).tolist()), dtype=float)
+
+
+def exact_charpoly(A):
+    """
+    Exact characteristic polynomial of an integer-valued matrix, using Berkowitz's
+    algorithm on Python integers (no rounding at any step).
+
+    Returns:
+    - List of Python ints, highest degree first.
+    """
+    A = np.asarray(A, dtype=float)
+    if not np.all(A == np.round(A)):
+        raise ValueError("Exact mode needs a matrix with integer entries")
+    return _berkowitz([[int(a) for a in row] for row in A])
+
+
+def mpmath_charpoly(A, dps=50):
+    """
+    Characteristic polynomial by Berkowitz's algorithm in mpmath arithmetic with
+    `dps` decimal digits. The float64 entries are converted exactly.
+
+    Returns:
+    - List of mpf, highest degree first.
+    """
+    if mpmath is None:
+        raise ValueError("The mpmath method needs the mpmath package")
+    ctx = mpmath.MPContext()
+    ctx.dps = dps
+    A = np.asarray(A, dtype=float)
+    coefficients = _berkowitz([[ctx.mpf(a) for a in row] for row in A])
+    return [ctx.mpf(c) for c in coefficients]
+
+
+def faddeev_leverrier_charpoly(A):
+    """
+    Characteristic polynomial by the Faddeev-LeVerrier recursion
+    M_k = A M_(k-1) + c_(n-k+1) I, c_(n-k) = -tr(A M_k) / k. Needs n matrix
+    products, O(n^4), and loses accuracy quickly as n grows; kept for teaching
+    and cross-checking.
+    """
+    A = np.asarray(A, dtype=float)
+    n = len(A)
+    coefficients = np.zeros(n + 1)
+    coefficients[0] = 1.0
+    M = np.eye(n)
+    with np.errstate(over="ignore", invalid="ignore"):
+        for k in range(1, n + 1):
+            AM = A @ M
+            coefficients[k] = -np.trace(AM) / k
+            M = AM + coefficients[k] * np.eye(n)
+    return coefficients
+
+
+def _int_to_float(value):
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def _matrix_hash(A):
+    A = np.ascontiguousarray(A, dtype=float)
+    digest = hashlib.sha256()
+    digest.update(str(A.shape).encode())
+    digest.update(A.data)
+    return digest.hexdigest()
+
+
+def characteristic_polynomial(A, method="auto", dps=50, eigenvalues=None):
+    """
+    Coefficients of det(xI - A), highest degree first, cached by matrix hash.
+
+    Args:
+    - A: Square matrix.
+    - method:
+      - "hessenberg": orthogonal Hessenberg reduction plus the minor recurrence,
+        O(n^3), the default for float matrices.
+      - "berkowitz": Berkowitz's division-free algorithm in float64, O(n^4).
+      - "faddeev": Faddeev-LeVerrier, O(n^4), for comparison only.
+      - "exact": Berkowitz on Python integers, for integer matrices.
+      - "mpmath": Berkowitz with `dps` digits.
+      - "eigenvalues": np.poly of the eigenvalues, the old behaviour.
+      - "auto": "exact" for integer matrices up to EXACT_LIMIT, else "hessenberg".
+      The SLOW_METHODS are only accepted up to SLOW_METHOD_LIMIT rows.
+    - dps: Decimal digits for the mpmath method.
+    - eigenvalues: Precomputed eigenvalues for the "eigenvalues" method.
+
+    Returns:
+    - dict with "coefficients" (float64 array, +/-inf where a coefficient
+      overflows), "exact_coefficients" (decimal strings for the exact and mpmath
+      methods, else None) and "method" (the method actually used). Each call gets
+      its own copy, so callers may modify it without touching the cache.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Invalid method. Must be one of {', '.join(METHODS)}.")
+    A = np.asarray(A, dtype=float)
+    if method in SLOW_METHODS and len(A) > SLOW_METHOD_LIMIT:
+        raise ValueError(
+            f"method={method} is limited to {SLOW_METHOD_LIMIT}x{SLOW_METHOD_LIMIT} "
+            "matrices; use hessenberg"
+        )
+    if method == "auto":
+        integer = bool(np.all(A == np.round(A))) and np.abs(A).max(initial=0) < 2**53
+        method = "exact" if integer and len(A) <= EXACT_LIMIT else "hessenberg"
+
+    key = (_matrix_hash(A), method, dps if method == "mpmath" else None)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _copy_result(_cache[key])
+
+    exact_coefficients = None
+    if method == "hessenberg":
+        coefficients = hessenberg_charpoly(A)
+    elif method == "berkowitz":
+        coefficients = berkowitz_charpoly(A)
+    elif method == "faddeev":
+        coefficients = faddeev_leverrier_charpoly(A)
+    elif method == "exact":
+        exact = exact_charpoly(A)
+        exact_coefficients = [str(c) for c in exact]
+        coefficients = np.array([_int_to_float(c) for c in exact])
+    elif method == "mpmath":
+        precise = mpmath_charpoly(A, dps)
+        exact_coefficients = [mpmath.nstr(c, dps) for c in precise]
+        coefficients = np.array([float(c) for c in precise])
+    else:
+        if eigenvalues is None:
+            eigenvalues = np.linalg.eigvals(A)
+        with np.errstate(over="ignore", invalid="ignore"):
+            coefficients = np.real_if_close(np.poly(eigenvalues))
+
+    result = {
+        "coefficients": coefficients,
+        "exact_coefficients": exact_coefficients,
+        "method": method,
+    }
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return _copy_result(result)
+
+
+def _copy_result(result):
+    exact_coefficients = result["exact_coefficients"]
+    return {
+        "coefficients": result["coefficients"].copy(),
+        "exact_coefficients": (
+            None if exact_coefficients is None else list(exact_coefficients)
+        ),
+        "method": result["method"],
+    }
@@ -0,0 +1,106 @@
+import numpy as np
+from scipy.linalg import solve_banded
+
+from app.services.integrators import euler_state_independent
+
+
+def sweep_grid(L, step_size):
+    """
+    The grid shared by every method of a sweep: N = L / step_size + 1 equally
+    spaced points from 0 to L inclusive (the spacing is adjusted slightly when
+    step_size does not divide L).
+
+    Returns:
+    - (y, h): the grid points and the actual spacing.
+    """
+    intervals = max(int(round(L / step_size)), 1)
+    y = np.linspace(0.0, L, intervals + 1)
+    return y, L / intervals
+
+
+def shoot_profiles(y, forcing, U0, integrator="explicit"):
+    """
+    Shooting for u'' = g, u(0) = 0, u(L) = U0 for a whole batch of constant
+    forcings g by superposition. The Euler solution is linear in both the initial
+    slope s and g, u = s Y + g W, so two integrations serve every forcing: Y with
+    s = 1, g = 0 and W with s = 0, g = 1. Each g then needs only its slope
+    s = (U0 - g W(L)) / Y(L) and one combination, with no loop over the batch.
+    The right-hand side depends on y alone, so each integration is a cumulative
+    sum over the grid (see integrators.euler_state_independent).
+
+    Args:
+    - y: Grid from 0 to L.
+    - forcing: Constant forcings g, shape (batch,).
+    - U0: Boundary value at y = L.
+    - integrator: "explicit" (Euler) or "implicit" (semi-implicit Euler).
+
+    Returns:
+    - (u, slopes): profiles of shape (batch, N) and the initial slopes.
+    """
+    if integrator not in ("explicit", "implicit"):
+        raise ValueError("Invalid integrator. Must be 'explicit' or 'implicit'.")
+    forcing = np.atleast_1d(np.asarray(forcing, dtype=float))
+    (Y, W), _ = euler_state_independent(
+        y, 0.0, np.array([1.0, 0.0]), np.array([[0.0], [1.0]]), integrator == "implicit"
+    )
+    slopes = (U0 - forcing * W[-1]) / Y[-1]
+    return np.outer(slopes, Y) + np.outer(forcing, W), slopes
+
+
+def finite_difference_batch(h, N, forcing, U0):
+    """
+    Central-difference solution of u'' = forcing, u(0) = 0, u(L) = U0 for many
+    forcings: the tridiagonal matrix does not depend on the forcing, so all of them
+    are right-hand sides of one banded solve.
+
+    Returns:
+    - Profiles of shape (batch, N).
+    """
+    ab = np.zeros((3, N))
+    ab[0, 2:] = 1 / h**2
+    ab[1, 1:-1] = -2 / h**2
+    ab[2, :-2] = 1 / h**2
+    ab[1, [0, -1]] = 1
+
+    forcing = np.atleast_1d(np.asarray(forcing, dtype=float))
+    if len(forcing) == 0:
+        # scipy's solve_banded corrupts memory on right-hand sides with no columns
+        return np.empty((0, N))
+    B = np.empty((N, len(forcing)))
+    B[:] = forcing
+    B[0] = 0.0  # u(0) = 0
+    B[-1] = U0  # u(L) = U0
+    return solve_banded((1, 1), ab, B).T
+
+
+def couette_sweep(P_values, step_size, mu=1.0, L=1.0, U0=1.0):
+    """
+    Couette-Poiseuille profiles mu u'' = -P, u(0) = 0, u(L) = U0 for many pressure
+    gradients in one pass: shooting takes two loop-free integrations for the
+    whole sweep and the finite-difference systems share one factorization.
+
+    Args:
+    - P_values: Pressure gradients.
+    - step_size: Grid spacing, see sweep_grid.
+    - mu, L, U0: Viscosity, channel width and velocity of the moving wall.
+
+    Returns:
+    - dict with "y" (the grid) and "explicit_euler", "implicit_euler",
+      "finite_difference", "analytical_solution", each of shape (len(P_values), N).
+    """
+    P = np.atleast_1d(np.asarray(P_values, dtype=float))
+    y, h = sweep_grid(L, step_size)
+    N = len(y)
+    forcing = -P / mu
+
+    explicit, _ = shoot_profiles(y, forcing, U0)
+    implicit, _ = shoot_profiles(y, forcing, U0, integrator="implicit")
+    analytical = (P / (2 * mu))[:, np.newaxis] * y * (L - y) + U0 * y / L
+
+    return {
+        "y": y,
+        "explicit_euler": explicit,
+        "implicit_euler": implicit,
+        "finite_difference": finite_difference_batch(h, N, forcing, U0),
+        "analytical_solution": analytical,
+    }
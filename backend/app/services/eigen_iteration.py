@@ -0,0 +1,215 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import eigs, eigsh, splu
+
+from app.services import lu_factors
+from app.services.structure import is_symmetric
+
+
+def _factor_shifted(A, sigma):
+    # Sparse matrices get a SuperLU factorization, which raises on an exactly
+    # singular matrix; dense ones get packed LAPACK factors
+    n = A.shape[0]
+    if sparse.issparse(A):
+        try:
+            return splu((A - sigma * sparse.identity(n)).tocsc())
+        except RuntimeError:
+            return None
+    return lu_factors.factor(A - sigma * np.eye(n))
+
+
+def _is_singular(factors):
+    if factors is None:
+        return True
+    if isinstance(factors, tuple):
+        return lu_factors.rank(factors) < len(factors[0])
+    return False
+
+
+def _solve(factors, x):
+    if isinstance(factors, tuple):
+        return lu_factors.solve(factors, x)
+    return factors.solve(x)
+
+
+def inverse_iteration(
+    A, shift=0.0, rayleigh=False, max_iterations=1000, tol=1e-10, x0=None, lu_piv=None
+):
+    """
+    Find the eigenvalue of A closest to `shift` by (shifted) inverse iteration.
+
+    A - shift * I is factored once and every step is an O(n^2) pair of triangular
+    solves. With rayleigh=True the shift is replaced by the Rayleigh quotient after
+    each step (Rayleigh quotient iteration): every step then refactors, but
+    convergence is cubic instead of linear for symmetric matrices.
+
+    Args:
+    - A: Square matrix, dense or scipy.sparse (factored with SuperLU).
+    - shift: Target around which the eigenvalue is sought (the initial shift for RQI).
+    - rayleigh: Update the shift with the Rayleigh quotient every step.
+    - max_iterations: Maximum number of iterations.
+    - tol: Converged when ||Ax - lambda x|| <= tol * max(1, |lambda|) for unit x.
+    - x0: Optional starting vector, random if omitted.
+    - lu_piv: Optional existing factors of A - shift * I (e.g. the solver's LU for
+      shift 0): a (lu, piv) pair for dense A, a SuperLU object for sparse A.
+
+    Returns:
+    - dict with "eigenvalue", "eigenvector", "iterations" and "converged".
+    """
+    if not sparse.issparse(A):
+        A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    x = np.random.rand(n) if x0 is None else np.array(x0, dtype=float)
+    x /= np.linalg.norm(x)
+
+    sigma = shift
+    if lu_piv is None:
+        lu_piv = _factor_shifted(A, sigma)
+    eigenvalue = x @ (A @ x)
+
+    for iteration in range(1, max_iterations + 1):
+        if _is_singular(lu_piv):
+            # The shift is (numerically) an eigenvalue already
+            return {
+                "eigenvalue": sigma,
+                "eigenvector": x,
+                "iterations": iteration - 1,
+                "converged": True,
+            }
+
+        y = _solve(lu_piv, x)
+        x = y / np.linalg.norm(y)
+
+        Ax = A @ x
+        eigenvalue = x @ Ax
+        if np.linalg.norm(Ax - eigenvalue * x) <= tol * max(1.0, abs(eigenvalue)):
+            return {
+                "eigenvalue": eigenvalue,
+                "eigenvector": x,
+                "iterations": iteration,
+                "converged": True,
+            }
+
+        if rayleigh:
+            sigma = eigenvalue
+            lu_piv = _factor_shifted(A, sigma)
+
+    return {
+        "eigenvalue": eigenvalue,
+        "eigenvector": x,
+        "iterations": max_iterations,
+        "converged": False,
+    }
+
+
+def subspace_iteration(
+    A, k, X0=None, max_iterations=500, tol=1e-8, symmetric=None
+):
+    """
+    Top-k eigenpairs (largest magnitude) by block orthogonal iteration with
+    Rayleigh-Ritz extraction.
+
+    Each step is one matrix-matrix product A @ Q on an n x m block (m slightly
+    larger than k), a thin QR and a small m x m eigenproblem, instead of a full
+    O(n^3) eigendecomposition.
+
+    Args:
+    - A: Square matrix, dense or scipy.sparse.
+    - k: Number of eigenpairs wanted.
+    - X0: Optional n x j starting block, e.g. eigenvectors cached for the same or a
+      slightly modified matrix. Missing columns are filled with random vectors.
+    - max_iterations: Maximum number of block iterations.
+    - tol: Converged when every wanted residual ||Av - lambda v|| is at most
+      tol * max(1, |lambda|).
+    - symmetric: Use the symmetric Rayleigh-Ritz step; detected from A when None.
+
+    Returns:
+    - dict with "eigenvalues", "eigenvectors" (n x k), "basis" (the final n x m block,
+      usable as X0 for a warm start), "iterations" and "converged".
+    """
+    if not sparse.issparse(A):
+        A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    k = min(k, n)
+    m = min(n, k + max(2, k // 2))  # A few guard vectors speed up convergence
+    if symmetric is None:
+        symmetric = is_symmetric(A)
+
+    X = np.random.rand(n, m)
+    if X0 is not None:
+        X0 = np.asarray(X0, dtype=float).reshape(n, -1)[:, :m]
+        X[:, : X0.shape[1]] = X0
+    Q, _ = np.linalg.qr(X)
+    AQ = A @ Q
+
+    for iteration in range(1, max_iterations + 1):
+        H = Q.T @ AQ
+        if symmetric:
+            values, W = np.linalg.eigh(H)
+        else:
+            values, W = np.linalg.eig(H)
+        order = np.argsort(-np.abs(values))
+        values, W = values[order], W[:, order]
+
+        vectors = Q @ W[:, :k]
+        residuals = np.linalg.norm(AQ @ W[:, :k] - vectors * values[:k], axis=0)
+        converged = np.all(residuals <= tol * np.maximum(1.0, np.abs(values[:k])))
+        if converged or iteration == max_iterations:
+            break
+
+        if symmetric:
+            # Rotating to the Ritz basis keeps the block ordered by magnitude
+            AQ = AQ @ W
+        Q, _ = np.linalg.qr(AQ)
+        AQ = A @ Q
+
+    return {
+        "eigenvalues": values[:k],
+        "eigenvectors": vectors,
+        "basis": Q,
+        "iterations": iteration,
+        "converged": bool(converged),
+    }
+
+
+def arnoldi_eigenpairs(A, k, v0=None, tol=1e-8, symmetric=None):
+    """
+    Top-k eigenpairs (largest magnitude) by implicitly restarted Lanczos (symmetric)
+    or Arnoldi (general) iteration via ARPACK.
+
+    Args:
+    - A: Square matrix (dense or sparse).
+    - k: Number of eigenpairs wanted, must be below n - 1 for general matrices.
+    - v0: Optional starting vector. The sum of cached eigenvectors makes a good
+      warm start, so an n x j block is accepted as well.
+    - tol: Relative accuracy requested from ARPACK.
+    - symmetric: Use Lanczos; detected from A when None.
+
+    Returns:
+    - dict with "eigenvalues", "eigenvectors", "basis" and "converged".
+    """
+    n = A.shape[0]
+    if symmetric is None:
+        symmetric = is_symmetric(A)
+    if v0 is not None:
+        v0 = np.asarray(v0, dtype=float).reshape(n, -1).sum(axis=1)
+        if not np.any(v0):
+            v0 = None
+
+    # A Krylov space well above ARPACK's default of 2k + 1 (at least 20) keeps it from
+    # settling on the wrong members of a cluster of nearly equal magnitudes, as in
+    # the spectrum of a random matrix
+    ncv = min(n, max(2 * k + 1, 40))
+    if symmetric:
+        values, vectors = eigsh(A, k=k, which="LM", v0=v0, tol=tol, ncv=ncv)
+    else:
+        values, vectors = eigs(A, k=k, which="LM", v0=v0, tol=tol, ncv=ncv)
+    order = np.argsort(-np.abs(values))
+    values, vectors = values[order], vectors[:, order]
+
+    return {
+        "eigenvalues": values,
+        "eigenvectors": vectors,
+        "basis": np.real(vectors),
+        "converged": True,
+    }
@@ -0,0 +1,113 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+
+class ComputeExecutor:
+    def __init__(self, max_threads=4, max_processes=2, max_queue=16, timeout=60.0):
+        """
+        Runs blocking NumPy/SciPy work outside the event loop.
+
+        LAPACK calls release the GIL and go to a thread pool; pure-Python loops
+        (e.g. the power method) go to a process pool. Each pool accepts at most
+        its worker count plus `max_queue` jobs; beyond that requests are rejected
+        with 429 so the queue cannot grow without bound. Jobs that take longer
+        than `timeout` seconds are answered with 503.
+
+        Args:
+        - max_threads: Worker threads for GIL-releasing linear algebra.
+        - max_processes: Worker processes for pure-Python loops.
+        - max_queue: Jobs allowed to wait per pool once all workers are busy.
+        - timeout: Default per-job timeout in seconds.
+        """
+        self.timeout = timeout
+        self._limits = {
+            "thread": max_threads + max_queue,
+            "process": max_processes + max_queue,
+        }
+        self._pending = {"thread": 0, "process": 0}
+        self._lock = threading.Lock()
+        self._max_processes = max_processes
+        self._threads = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="compute"
+        )
+        self._processes = None  # Started on first use
+
+    async def run_in_thread(self, func, *args, timeout=None, **kwargs):
+        """
+        Run func(*args, **kwargs) in the thread pool and return its result.
+        """
+        return await self._submit("thread", partial(func, *args, **kwargs), timeout)
+
+    async def run_in_process(self, func, *args, timeout=None, **kwargs):
+        """
+        Run func(*args, **kwargs) in the process pool and return its result.
+        func and its arguments must be picklable.
+        """
+        return await self._submit("process", partial(func, *args, **kwargs), timeout)
+
+    def shutdown(self):
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._processes is not None:
+            self._processes.shutdown(wait=False, cancel_futures=True)
+
+    def _pool(self, kind):
+        if kind == "thread":
+            return self._threads
+        with self._lock:
+            if self._processes is None:
+                # spawn avoids forking a process that already runs threads
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self._max_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._processes
+
+    def _release(self, kind, _future=None):
+        with self._lock:
+            self._pending[kind] -= 1
+
+    async def _submit(self, kind, job, timeout):
+        with self._lock:
+            if self._pending[kind] >= self._limits[kind]:
+                raise HTTPException(
+                    status_code=429,
+                    detail="Server is busy, please retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending[kind] += 1
+
+        try:
+            future = self._pool(kind).submit(job)
+        except Exception:
+            self._release(kind)
+            raise
+        # The slot is freed when the job really finishes, not when we stop waiting
+        future.add_done_callback(partial(self._release, kind))
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future),
+                timeout=self.timeout if timeout is None else timeout,
+            )
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HTTPException(
+                status_code=503,
+                detail="Computation timed out",
+                headers={"Retry-After": "5"},
+            )
+
+
+compute_executor = ComputeExecutor(
+    max_threads=settings.COMPUTE_THREADS,
+    max_processes=settings.COMPUTE_PROCESSES,
+    max_queue=settings.COMPUTE_QUEUE_DEPTH,
+    timeout=settings.COMPUTE_TIMEOUT,
+)
@@ -0,0 +1,147 @@
+import math
+from fractions import Fraction
+from functools import lru_cache
+
+try:
+    import mpmath
+except ImportError:  # The table and the asymptotic formula still work without it
+    mpmath = None
+
+# 2-norm condition numbers of the n x n Hilbert matrix for common n, computed in
+# high precision (floating-point SVDs are meaningless beyond n ~ 13)
+HILBERT_CONDITION_TABLE = {
+    1: 1.0,
+    2: 19.28147006790397,
+    3: 524.0567775860608,
+    4: 15513.738738932589,
+    5: 476607.2502425608,
+    6: 14951058.640131216,
+    7: 475367354.98817897,
+    8: 15257575741.646942,
+    9: 493154926971.5421,
+    10: 16026286870216.883,
+    11: 523067739242940.9,
+    12: 1.713228904697005e16,
+    13: 5.627942373760077e17,
+    14: 1.85338170234715e19,
+    15: 6.116565791619841e20,
+    16: 2.02234591767453e22,
+    17: 6.697438980560631e23,
+    18: 2.2211900394338648e25,
+    19: 7.375951180508842e26,
+    20: 2.4521565858153033e28,
+}
+
+# Largest n computed with mpmath; the exact value there anchors the asymptotic formula
+HIGH_PRECISION_LIMIT = 100
+ANCHOR_CONDITION = 3.7764862742167324e150  # cond(H_100)
+
+# cond_1(H_n) is formed exactly and exceeds the float64 range from n = 203 on
+ONE_NORM_FLOAT_LIMIT = 202
+
+LOG_GROWTH = 4 * math.log(1 + math.sqrt(2))  # cond(H_n) ~ C (1 + sqrt 2)^(4n) / sqrt(n)
+LOG_FLOAT_MAX = math.log(1.7976931348623157e308)
+
+
+def _inverse_hilbert_entry(n, i, j):
+    # Closed form of (H_n^-1)_ij for 1-based i, j; all entries are integers
+    return (
+        (-1) ** (i + j)
+        * (i + j - 1)
+        * math.comb(n + i - 1, n - j)
+        * math.comb(n + j - 1, n - i)
+        * math.comb(i + j - 2, i - 1) ** 2
+    )
+
+
+def _largest_eigenvalue(ctx, M, tol):
+    # Power iteration for a symmetric positive definite matrix given as lists
+    x = [ctx.mpf(1)] * len(M)
+    estimate = ctx.zero
+    while True:
+        y = [ctx.fsum(a * b for a, b in zip(row, x)) for row in M]
+        norm = ctx.sqrt(ctx.fsum(v * v for v in y))
+        x = [v / norm for v in y]
+        if abs(norm - estimate) <= tol * norm:
+            return norm
+        estimate = norm
+
+
+def _high_precision_condition(n):
+    """
+    cond_2(H_n) = lambda_max(H_n) * lambda_max(H_n^-1), both by power iteration
+    in extended precision; H_n^-1 is formed exactly from its closed form.
+    """
+    ctx = mpmath.MPContext()
+    ctx.dps = 30 + n
+    H = [[ctx.mpf(1) / (i + j - 1) for j in range(1, n + 1)] for i in range(1, n + 1)]
+    H_inverse = [
+        [ctx.mpf(_inverse_hilbert_entry(n, i, j)) for j in range(1, n + 1)]
+        for i in range(1, n + 1)
+    ]
+    tol = ctx.mpf(10) ** -20
+    largest = _largest_eigenvalue(ctx, H, tol)
+    return float(largest * _largest_eigenvalue(ctx, H_inverse, tol))
+
+
+def _asymptotic_condition(n):
+    """
+    cond(H_n) ~ C (1 + sqrt 2)^(4n) / sqrt(n), with C taken from the exact value
+    at n = HIGH_PRECISION_LIMIT. Accurate to a few percent near the anchor; inf
+    once the value leaves the float64 range (n > ~200).
+    """
+    log_condition = (
+        math.log(ANCHOR_CONDITION)
+        + LOG_GROWTH * (n - HIGH_PRECISION_LIMIT)
+        - 0.5 * math.log(n / HIGH_PRECISION_LIMIT)
+    )
+    if log_condition > LOG_FLOAT_MAX:
+        return math.inf
+    return math.exp(log_condition)
+
+
+def _one_norm_condition(n):
+    """
+    cond_1(H_n) = ||H_n||_1 ||H_n^-1||_1 in exact arithmetic: the largest column
+    sum of H_n is the harmonic number of its first column, and H_n^-1 has integer
+    entries. O(n^2) integer operations.
+    """
+    if n > ONE_NORM_FLOAT_LIMIT:
+        return math.inf
+    norm = sum(Fraction(1, i) for i in range(1, n + 1))
+    inverse_norm = max(
+        sum(abs(_inverse_hilbert_entry(n, i, j)) for i in range(1, n + 1))
+        for j in range(1, n + 1)
+    )
+    return float(norm * inverse_norm)
+
+
+@lru_cache(maxsize=None)
+def hilbert_condition(n, norm="2"):
+    """
+    Condition number of the n x n Hilbert matrix, in O(1) after the first call for
+    each n and norm.
+
+    2-norm values come from the precomputed table for n <= 20, from a
+    high-precision computation (mpmath, if installed) up to
+    n = HIGH_PRECISION_LIMIT, and from the asymptotic formula otherwise. 1-norm
+    values are exact, see _one_norm_condition.
+
+    Args:
+    - n: Matrix size.
+    - norm: "2" or "1"; compare like with like, e.g. "1" for gecon estimates.
+
+    Returns:
+    - The condition number as a float, inf beyond the float64 range.
+    """
+    if n < 1:
+        raise ValueError("The Hilbert matrix size must be at least 1")
+    if norm == "1":
+        return _one_norm_condition(n)
+    if norm != "2":
+        raise ValueError("Invalid norm. Must be '1' or '2'.")
+    if n in HILBERT_CONDITION_TABLE:
+        return HILBERT_CONDITION_TABLE[n]
+    if mpmath is not None and n <= HIGH_PRECISION_LIMIT:
+        return _high_precision_condition(n)
+    return _asymptotic_condition(n)
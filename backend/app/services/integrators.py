@@ -0,0 +1,123 @@
+import numpy as np
+
+INTEGRATORS = ("explicit", "implicit", "rk4")
+
+
+def euler_grid(step_size, y_end):
+    """
+    The grid of the fixed-step Euler integrators: int(y_end / step_size) + 1 points
+    0, h, 2h, ... (the last point is y_end only when h divides it).
+    """
+    return np.arange(int(y_end / step_size) + 1) * step_size
+
+
+def euler_state_independent(y, u0, v0, forcing, implicit=False):
+    """
+    Explicit or semi-implicit Euler for u'' = g(y), where the right-hand side does
+    not depend on the state, without a per-step loop.
+
+    Explicit Euler gives v_i = v_0 + sum_(j<i) h_j g_j and
+    u_i = u_0 + sum_(j<i) h_j v_j; semi-implicit Euler updates v first and uses
+    the new value, u_i = u_0 + sum_(0<j<=i) h_(j-1) v_j. Both are cumulative sums, so a whole
+    trajectory (or a batch of them) is a few vectorized passes over the grid.
+
+    Args:
+    - y: Grid, shape (N,).
+    - u0, v0: Initial value and slope, scalars or arrays of a common batch shape.
+    - forcing: g on the grid: a scalar, an array broadcastable to batch + (N,) (use
+      a trailing axis of length 1 for one constant per trajectory), or a function
+      of y.
+    - implicit: Use semi-implicit instead of explicit Euler.
+
+    Returns:
+    - (u, v) with shape batch + (N,).
+    """
+    y = np.asarray(y, dtype=float)
+    if callable(forcing):
+        forcing = forcing(y)
+    u0 = np.asarray(u0, dtype=float)[..., np.newaxis]
+    v0 = np.asarray(v0, dtype=float)[..., np.newaxis]
+    forcing = np.asarray(forcing, dtype=float)
+    if forcing.ndim == 0 or forcing.shape[-1] == 1:
+        forcing = np.broadcast_to(forcing, forcing.shape[:-1] + (len(y),))
+    shape = np.broadcast_shapes(u0.shape, v0.shape, forcing.shape[:-1] + (1,))
+    h = np.diff(y)
+
+    # Increments of v over each step use g at the start of the step
+    v = np.empty(shape[:-1] + (len(y),))
+    v[..., :1] = v0
+    increments = np.broadcast_to(h * forcing[..., :-1], v[..., 1:].shape)
+    np.cumsum(increments, axis=-1, out=v[..., 1:])
+    v[..., 1:] += v0
+
+    # u accumulates h times the old (explicit) or the new (semi-implicit) slope
+    u = np.empty_like(v)
+    u[..., :1] = u0
+    slopes = v[..., 1:] if implicit else v[..., :-1]
+    np.cumsum(h * slopes, axis=-1, out=u[..., 1:])
+    u[..., 1:] += u0
+    return u, v
+
+
+def _advance(acceleration, y, h, positions, velocities, integrator):
+    # One step of x'' = acceleration(y, x, x') for stacked positions / velocities
+    if integrator == "explicit":
+        a = acceleration(y, positions, velocities)
+        return positions + h * velocities, velocities + h * a
+    if integrator == "implicit":
+        # Semi-implicit Euler: the velocity first, then the position with the new one
+        velocities = velocities + h * acceleration(y, positions, velocities)
+        return positions + h * velocities, velocities
+    k1x, k1v = velocities, acceleration(y, positions, velocities)
+    k2x = velocities + h / 2 * k1v
+    k2v = acceleration(y + h / 2, positions + h / 2 * k1x, k2x)
+    k3x = velocities + h / 2 * k2v
+    k3v = acceleration(y + h / 2, positions + h / 2 * k2x, k3x)
+    k4x = velocities + h * k3v
+    k4v = acceleration(y + h, positions + h * k3x, k4x)
+    return (
+        positions + h / 6 * (k1x + 2 * k2x + 2 * k3x + k4x),
+        velocities + h / 6 * (k1v + 2 * k2v + 2 * k3v + k4v),
+    )
+
+
+def integrate_second_order(
+    acceleration, y, positions, velocities, integrator, state_independent=False
+):
+    """
+    Integrate x'' = acceleration(y, x, x') over the grid y for arrays of initial
+    positions and velocities, all advanced in lock-step: one vectorized update of
+    the whole batch per grid step, into preallocated arrays.
+
+    Args:
+    - acceleration: Vectorized right-hand side.
+    - y: Grid, shape (N,).
+    - positions, velocities: Initial values, broadcast to a common batch shape.
+    - integrator: "explicit" (Euler), "implicit" (semi-implicit Euler) or "rk4".
+    - state_independent: The acceleration depends on y alone. The Euler schemes
+      then run without a step loop, see euler_state_independent.
+
+    Returns:
+    - (x, v): arrays of shape batch + (N,).
+    """
+    if integrator not in INTEGRATORS:
+        raise ValueError(
+            f"Invalid integrator. Must be one of {', '.join(INTEGRATORS)}."
+        )
+    positions, velocities = np.broadcast_arrays(
+        np.asarray(positions, dtype=float), np.asarray(velocities, dtype=float)
+    )
+    if state_independent and integrator != "rk4":
+        forcing = np.broadcast_to(acceleration(y, 0.0, 0.0), np.shape(y))
+        return euler_state_independent(
+            y, positions, velocities, forcing, integrator == "implicit"
+        )
+    x = np.empty(positions.shape + (len(y),))
+    v = np.empty_like(x)
+    x[..., 0], v[..., 0] = positions, velocities
+    for i in range(1, len(y)):
+        h = y[i] - y[i - 1]
+        x[..., i], v[..., i] = _advance(
+            acceleration, y[i - 1], h, x[..., i - 1], v[..., i - 1], integrator
+        )
+    return x, v
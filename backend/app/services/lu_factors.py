@@ -0,0 +1,108 @@
+import warnings
+
+import numpy as np
+from scipy.linalg import LinAlgWarning, lapack, lu_factor, lu_solve
+
+
+def factor(A):
+    """
+    Factor A once with partial pivoting into LAPACK's compact storage.
+
+    Args:
+    - A: Square matrix.
+
+    Returns:
+    - (lu, piv): L (unit diagonal, below) and U (on and above the diagonal) packed
+      in one n x n array, and the row interchanges as a pivot index vector.
+    """
+    with warnings.catch_warnings():
+        # Singular matrices are reported through slogdet/rank instead
+        warnings.simplefilter("ignore", LinAlgWarning)
+        return lu_factor(A, check_finite=False)
+
+
+def solve(lu_piv, b):
+    """
+    Solve Ax = b with the packed factors: apply the row interchanges, then
+    forward substitution with unit-lower L and back substitution with U.
+    Costs O(n^2) per right-hand side; b may be a vector or an n x k matrix.
+    """
+    return lu_solve(lu_piv, b, check_finite=False)
+
+
+def slogdet(lu_piv):
+    """
+    Sign and natural log of |det(A)| from the LU factors.
+
+    Unlike the determinant itself, log|det| does not overflow or underflow for large n.
+
+    Returns:
+    - (sign, logabsdet): sign is 1, -1 or 0; logabsdet is -inf for a singular matrix.
+    """
+    lu, piv = lu_piv
+    diag = np.diag(lu)
+    swaps = np.count_nonzero(piv != np.arange(len(piv)))
+
+    if np.any(diag == 0):
+        return 0.0, -np.inf
+    sign = (-1.0) ** (swaps + np.count_nonzero(diag < 0))
+    return sign, float(np.sum(np.log(np.abs(diag))))
+
+
+def determinant(lu_piv):
+    """
+    det(A) from the LU factors. Overflows to +/-inf for very large determinants;
+    use slogdet when that matters.
+    """
+    sign, logabsdet = slogdet(lu_piv)
+    with np.errstate(over="ignore"):
+        return sign * np.exp(logabsdet)
+
+
+def rank(lu_piv, tol=None):
+    """
+    Numerical rank estimated from the pivots of U.
+
+    A pivot counts as zero when it is below `tol`, by default
+    n * eps * max|u_ii| (the same scaling np.linalg.matrix_rank uses for singular values).
+    """
+    lu, _ = lu_piv
+    pivots = np.abs(np.diag(lu))
+    if tol is None:
+        tol = len(pivots) * np.finfo(lu.dtype).eps * (pivots.max() if len(pivots) else 0)
+    return int(np.count_nonzero(pivots > tol))
+
+
+def condition_estimate(lu_piv, anorm, norm="1"):
+    """
+    Estimate the condition number from existing LU factors with LAPACK gecon,
+    i.e. Hager's method as refined by Higham: a few solves with the factors give
+    a lower bound on ||A^-1|| that is almost always within a small factor of it.
+    Costs O(n^2) after the factorization.
+
+    Args:
+    - lu_piv: The (lu, piv) pair returned by factor.
+    - anorm: The norm of the original matrix, in the same norm.
+    - norm: "1" for the 1-norm, "I" for the infinity norm.
+
+    Returns:
+    - The condition number estimate, inf if the matrix is singular.
+    """
+    lu, _ = lu_piv
+    if anorm == 0 or np.any(np.diag(lu) == 0):
+        return np.inf
+    gecon = lapack.get_lapack_funcs("gecon", (lu,))
+    rcond, info = gecon(lu, anorm, norm=norm)
+    if info != 0 or rcond == 0:
+        return np.inf
+    return 1.0 / rcond
+
+
+def permutation_matrix(piv):
+    """
+    Dense permutation matrix P with A = P @ L @ U, as returned by scipy.linalg.lu.
+    """
+    perm = np.arange(len(piv))
+    for i, p in enumerate(piv):
+        perm[[i, p]] = perm[[p, i]]
+    return np.eye(len(piv))[perm].T
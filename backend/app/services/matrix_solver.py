@@ -1,5 +1,69 @@
 import numpy as np
-from scipy.linalg import hilbert, lu
+from scipy.linalg import (
+    cho_solve,
+    cho_solve_banded,
+    eigvals_banded,
+    lapack,
+    solve_banded,
+    solve_triangular,
+)
+
+from app.services import lu_factors
+from app.services.analysis_pipeline import analyze_matrix
+from app.services.charpoly import characteristic_polynomial
+from app.services.eigen_iteration import (
+    arnoldi_eigenpairs,
+    inverse_iteration,
+    subspace_iteration,
+)
+from app.services.hilbert_reference import hilbert_condition
+from app.services.structure import (
+    banded_storage,
+    detect_structure,
+    factor_cholesky,
+)
+
+
+def power_method(A, inverse=False, max_iterations=1000, tol=1e-3, lu_piv=None):
+    """
+    Power iteration on A, or on its inverse if inverse=True.
+
+    The inverse variant never forms A^-1: it runs inverse iteration on one LU
+    factorization of A (pass `lu_piv` to reuse existing factors).
+    Kept as a module-level function so it can be shipped to a worker process.
+
+    Returns:
+    - The dominant eigenvalue estimate (of A^-1 if inverse=True), or "Did not converge".
+    """
+    if inverse:
+        if lu_piv is None:
+            lu_piv = lu_factors.factor(A)
+        if lu_factors.rank(lu_piv) < len(A):
+            raise np.linalg.LinAlgError("Singular matrix")
+        result = inverse_iteration(
+            A, max_iterations=max_iterations, tol=tol, lu_piv=lu_piv
+        )
+        if not result["converged"]:
+            return "Did not converge"
+        # The dominant eigenvalue of A^-1 is the reciprocal of A's smallest one
+        return 1.0 / result["eigenvalue"]
+
+    x = np.random.rand(len(A))
+    x /= np.linalg.norm(x)
+
+    eigenvalue = None
+    for _ in range(max_iterations):
+        x_new = np.dot(A, x)
+        new_eigenvalue = np.dot(x_new, x) / np.dot(x, x)
+        x_new /= np.linalg.norm(x_new)
+
+        if np.linalg.norm(x_new - x) < tol:
+            eigenvalue = new_eigenvalue
+            break
+        x = x_new
+
+    return eigenvalue if eigenvalue else "Did not converge"
+
 
 class AccurateMatrixSolver:
     def __init__(self, matrix, b1, b2):
@@ -10,94 +74,338 @@ class AccurateMatrixSolver:
         - matrix: The coefficient matrix A.
         - b1, b2: Two different right-hand side vectors for the linear systems Ax = b1, Ax = b2.
         """
-        self.A = np.array(matrix, dtype=float)
-        self.b1 = np.array(b1, dtype=float)
-        self.b2 = np.array(b2, dtype=float)
+        # asarray keeps float64 uploads (e.g. memory-mapped binary files) uncopied
+        self.A = np.asarray(matrix, dtype=float)
+        self.b1 = np.asarray(b1, dtype=float)
+        self.b2 = np.asarray(b2, dtype=float)
         self.n = len(matrix)  # Size of the matrix (assumed to be square)
-        self.L = None  # Lower triangular matrix after LU decomposition
-        self.U = None  # Upper triangular matrix after LU decomposition
-        self.P = None  # Permutation matrix after LU decomposition
+        self._lu_piv = None  # Packed LU factors and pivot indices
         self.eigenvalues = None  # To store eigenvalues after computation
+        self._determinant = None  # Cached determinant
+        self._condition_number = None  # Cached condition number
+        self._condition_estimate = None  # Cached 1-norm condition estimate
+        self._analysis = None  # Cached results of the process-all pipeline
+        self._top_basis = None  # Last subspace from top_eigenpairs, for warm starts
+        self._structure = None  # Detected structure, see structure.detect_structure
+        self._banded = None  # Diagonal-ordered storage for the banded solve path
+
+    def lu_factorization(self):
+        """
+        Factor the matrix once with partial pivoting and keep the compact
+        (lu, piv) storage. Determinant, rank and solves all reuse these factors.
+
+        Returns:
+        - The (lu, piv) pair, see lu_factors.factor.
+        """
+        if self._lu_piv is None:
+            self._lu_piv = lu_factors.factor(self.A)
+        return self._lu_piv
+
+    def structure(self):
+        """
+        Detect the structure of the matrix once (symmetry, bandwidth,
+        triangularity; definiteness on demand, see positive_definite). Solves,
+        eigenvalues, the determinant and the condition number dispatch on it.
+
+        Returns:
+        - dict, see structure.detect_structure.
+        """
+        if self._structure is None:
+            self._structure = detect_structure(self.A)
+        return self._structure
+
+    def positive_definite(self):
+        """
+        Whether the matrix is symmetric positive definite. The Cholesky attempt
+        that decides it runs on the first call that needs it and is cached in
+        structure(), see structure.factor_cholesky.
+        """
+        return factor_cholesky(self.A, self.structure())
+
+    def structure_report(self):
+        """
+        The detected structure and the routines chosen for it, without the factors.
+        """
+        return {k: v for k, v in self.structure().items() if k != "cholesky"}
 
     def lu_decomposition(self):
         """
-        Perform LU decomposition with pivoting using scipy's lu function.
-        Raises:
-        - ValueError: If the matrix is singular (determinant is zero).
+        Expand the cached LU factors into dense P, L, U matrices with A = PLU.
+        The dense matrices are built for the response only and not kept.
+        Returns:
+        - dict with "P", "L", "U", or an error if the matrix is singular.
         """
-        if np.isclose(np.linalg.det(self.A), 0):
+        if self.is_singular():
             return {"error": "Matrix is singular, LU decomposition failed."}
-        try:
-            self.P, self.L, self.U = lu(self.A)
-            return {"P": self.P.tolist(), "L": self.L.tolist(), "U": self.U.tolist()}
-        except Exception as e:
-            return {"error": f"LU decomposition failed: {str(e)}"}
+        lu, piv = self.lu_factorization()
+        return {
+            "P": lu_factors.permutation_matrix(piv).tolist(),
+            "L": (np.tril(lu, k=-1) + np.eye(self.n)).tolist(),
+            "U": np.triu(lu).tolist(),
+        }
+
+    def analysis(self):
+        """
+        Run the single-pass analysis pipeline (one LU, one eigendecomposition) and
+        cache its results. The eigenvalues and determinant are shared with the
+        individual methods below.
+
+        Returns:
+        - dict of results, see analysis_pipeline.analyze_matrix.
+        """
+        if self._analysis is None:
+            self._analysis = analyze_matrix(
+                self.A,
+                self.b1,
+                self.b2,
+                self.lu_factorization(),
+                self.eigenvalues_via_lu(),
+                self.condition_estimate(),
+            )
+            if self.eigenvalues is None:
+                self.eigenvalues = self._analysis["eigenvalues"]
+            if self._determinant is None:
+                self._determinant = self._analysis["determinant"]
+        return self._analysis
 
     def eigenvalues_via_lu(self):
         """
-        Calculate the eigenvalues using NumPy's eig method.
+        Calculate the eigenvalues with the cheapest routine the structure allows:
+        the diagonal for diagonal and triangular matrices, the banded or dense
+        symmetric eigensolver for symmetric matrices, NumPy's eig otherwise.
+        The result is cached after the first call.
         Returns:
         - The eigenvalues of the matrix.
         """
-        self.eigenvalues = np.linalg.eigvals(self.A)
+        if self.eigenvalues is None:
+            structure = self.structure()
+            path = structure["paths"]["eigenvalues"]
+            if path == "diagonal":
+                self.eigenvalues = np.diag(self.A).copy()
+            elif path == "eigvals_banded":
+                upper = structure["upper_bandwidth"]
+                self.eigenvalues = eigvals_banded(
+                    banded_storage(self.A, 0, upper), lower=False
+                )
+            elif path == "eigvalsh":
+                self.eigenvalues = np.linalg.eigvalsh(self.A)
+            else:
+                self.eigenvalues = np.linalg.eigvals(self.A)
         return self.eigenvalues
 
-    def polynomial_equation(self):
+    def polynomial_equation(self, method="auto", dps=50):
         """
-        Calculate the characteristic polynomial of the matrix based on its eigenvalues.
+        Calculate the characteristic polynomial of the matrix.
+
+        By default integer matrices get exact coefficients and all others go
+        through the Hessenberg form, see charpoly.characteristic_polynomial.
+        method="eigenvalues" keeps the old np.poly of the eigenvalues.
+
+        Args:
+        - method: "auto", "hessenberg", "berkowitz", "faddeev", "exact", "mpmath"
+          or "eigenvalues".
+        - dps: Decimal digits for method="mpmath".
 
         Returns:
-        - The coefficients of the characteristic polynomial.
+        - dict with "coefficients", "exact_coefficients" and "method".
         """
-        if self.eigenvalues is None:
-            self.eigenvalues_via_lu()
-
-        # Use numpy's poly function to get polynomial coefficients from eigenvalues
-        coefficients = np.poly(self.eigenvalues)
-        return coefficients
+        eigenvalues = None
+        if method == "eigenvalues":
+            eigenvalues = self.eigenvalues_via_lu()
+        return characteristic_polynomial(self.A, method, dps, eigenvalues)
 
     def determinant(self):
         """
-        Calculate the determinant of the matrix using NumPy's det function.
+        Calculate the determinant of the matrix from its LU factors.
+        The result is cached after the first call.
+        Returns:
+        - The determinant of the matrix (+/-inf if it overflows, see log_determinant).
+        """
+        if self._determinant is None:
+            sign, logabsdet = self.log_determinant()
+            with np.errstate(over="ignore"):
+                self._determinant = sign * np.exp(logabsdet)
+        return self._determinant
+
+    def log_determinant(self):
+        """
+        Calculate the sign and log of the absolute determinant from the diagonal
+        (diagonal and triangular matrices), the Cholesky factor (SPD matrices) or
+        the LU factors. Stays finite for large matrices whose determinant over-
+        or underflows.
+
+        Returns:
+        - (sign, logabsdet), with sign 0 and logabsdet -inf for a singular matrix.
+        """
+        structure = self.structure()
+        if structure["paths"]["eigenvalues"] == "diagonal":
+            diag = np.diag(self.A)
+            if np.any(diag == 0):
+                return 0.0, -np.inf
+            sign = (-1.0) ** np.count_nonzero(diag < 0)
+            return sign, float(np.sum(np.log(np.abs(diag))))
+        if self.positive_definite():
+            # det(A) = det(R)^2 for A = R^T R
+            return 1.0, 2.0 * float(np.sum(np.log(self._cholesky_diagonal())))
+        return lu_factors.slogdet(self.lu_factorization())
+
+    def _cholesky_diagonal(self):
+        structure = self.structure()
+        if structure["kind"] == "banded":
+            # Upper banded storage keeps the diagonal of R in the last row
+            return structure["cholesky"][-1]
+        return np.diag(structure["cholesky"][0])
+
+    def _nonzero_diagonal(self):
+        # Diagonal entries above n * eps * max|a_ii|, the tolerance of the LU rank
+        pivots = np.abs(np.diag(self.A))
+        tol = self.n * np.finfo(float).eps * (pivots.max() if self.n else 0)
+        return int(np.count_nonzero(pivots > tol))
+
+    def rank(self):
+        """
+        Estimate the numerical rank along the detected structure: SPD matrices have
+        full rank, diagonal matrices as many as nonzero diagonal entries, and
+        triangular ones full rank when no diagonal entry is zero (an SVD decides
+        otherwise). The remaining cases count the pivots of the LU factors.
+
         Returns:
-        - The determinant of the matrix.
+        - The number of diagonal entries or pivots that are not negligible relative
+          to the largest one.
+        """
+        structure = self.structure()
+        if self.positive_definite():
+            return self.n
+        if structure["paths"]["eigenvalues"] == "diagonal":
+            nonzero = self._nonzero_diagonal()
+            if structure["kind"] == "diagonal" or nonzero == self.n:
+                return nonzero
+            # A triangular matrix with zeros on its diagonal can have a higher rank
+            # than its nonzero diagonal entries, e.g. [[0, 1], [0, 0]]; it is its
+            # own LU factor, so the pivots would not tell either
+            return int(np.linalg.matrix_rank(self.A))
+        return lu_factors.rank(self.lu_factorization())
+
+    def is_singular(self):
+        """
+        Check whether the matrix is numerically singular (rank deficient).
+        Diagonal and triangular matrices are checked on their diagonal, SPD
+        matrices never are; everything else goes through the LU pivots.
         """
-        return np.linalg.det(self.A)
+        structure = self.structure()
+        if self.positive_definite():
+            return False
+        if structure["paths"]["eigenvalues"] == "diagonal":
+            return self._nonzero_diagonal() < self.n
+        return self.rank() < self.n
 
     def is_unique(self):
         """
         Check if the matrix has a unique solution for the system Ax = b.
-        A unique solution exists if the determinant is non-zero.
+        A unique solution exists if the matrix has full numerical rank.
 
         Returns:
         - True if the matrix has a unique solution, False otherwise.
         """
-        det = self.determinant()
-        return (
-            abs(det) > 1e-10
-        )  # Use a small threshold to account for floating-point precision
+        return not self.is_singular()
 
     def condition_number_via_eigenvalues(self):
         """
         Compute the condition number of the matrix using NumPy's cond function.
+        The result is cached after the first call.
 
         Returns:
         - The condition number of the matrix.
         - Inf if the matrix is singular or ill-conditioned.
         """
-        return np.linalg.cond(self.A)
+        if self._condition_number is None:
+            if self.structure()["paths"]["condition"] == "eigenvalues":
+                # For symmetric A the singular values are the |eigenvalues|
+                magnitudes = np.abs(self.eigenvalues_via_lu())
+                smallest = magnitudes.min() if self.n else 1.0
+                self._condition_number = (
+                    magnitudes.max() / smallest if smallest > 0 else np.inf
+                )
+            else:
+                self._condition_number = np.linalg.cond(self.A)
+        return self._condition_number
+
+    def condition_estimate(self):
+        """
+        Estimate the 1-norm condition number in O(n^2) from factors the solver
+        already has (LAPACK's Hager/Higham estimator: gecon on the LU factors,
+        pocon on the Cholesky factor). Triangular matrices are their own factors,
+        and for diagonal matrices the ratio of the diagonal is exact.
+        The result is cached after the first call.
+
+        Returns:
+        - The condition number estimate, inf if the matrix is singular.
+        """
+        if self._condition_estimate is None:
+            self._condition_estimate = self._estimate_condition()
+        return self._condition_estimate
+
+    def _estimate_condition(self):
+        structure = self.structure()
+        kind = structure["kind"]
+        anorm = np.linalg.norm(self.A, 1)
+
+        if kind == "diagonal":
+            magnitudes = np.abs(np.diag(self.A))
+            smallest = magnitudes.min() if self.n else 1.0
+            return magnitudes.max() / smallest if smallest > 0 else np.inf
+        if self.is_singular():
+            return np.inf
+        if kind == "upper_triangular":
+            # An upper triangular matrix is its own LU factorization (L = I)
+            return lu_factors.condition_estimate(
+                (self.A, np.arange(self.n)), anorm
+            )
+        if kind == "lower_triangular":
+            # cond_1(L) = cond_inf(L^T), and L^T is upper triangular
+            return lu_factors.condition_estimate(
+                (self.A.T, np.arange(self.n)), anorm, norm="I"
+            )
+        if kind != "banded" and self.positive_definite():
+            pocon = lapack.get_lapack_funcs("pocon", (self.A,))
+            rcond, info = pocon(structure["cholesky"][0], anorm, uplo="U")
+            return 1.0 / rcond if info == 0 and rcond > 0 else np.inf
+        return lu_factors.condition_estimate(self.lu_factorization(), anorm)
+
+    def condition_number(self, method="estimate"):
+        """
+        Condition number of the matrix.
+
+        Args:
+        - method: "estimate" for the O(n^2) 1-norm estimate from the factors
+          (see condition_estimate), "exact" for the 2-norm condition number
+          from the singular values (or the eigenvalues of a symmetric matrix).
+
+        Returns:
+        - The condition number, inf if the matrix is singular.
+        """
+        if method == "estimate":
+            return self.condition_estimate()
+        if method == "exact":
+            return self.condition_number_via_eigenvalues()
+        raise ValueError("Invalid method. Must be 'estimate' or 'exact'.")
 
-    def compare_with_hilbert(self):
+    def compare_with_hilbert(self, method="estimate"):
         """
         Compare the condition number of the matrix with that of a Hilbert matrix of the same size.
+        The Hilbert reference comes from hilbert_reference and costs O(1); it is
+        taken in the same norm as the matrix's: the 1-norm for "estimate", the
+        2-norm for "exact".
+
+        Args:
+        - method: "estimate" or "exact", see condition_number.
 
         Returns:
         - The condition number of the matrix and the condition number of the Hilbert matrix.
         """
-        hilbert_matrix = hilbert(self.n)
-        hilbert_cond = np.linalg.cond(hilbert_matrix)
-        our_cond = self.condition_number_via_eigenvalues()
-        return our_cond, hilbert_cond
+        our_cond = self.condition_number(method)
+        norm = "1" if method == "estimate" else "2"
+        return our_cond, hilbert_condition(self.n, norm)
 
     def power_method(self, inverse=False, max_iterations=1000, tol=1e-3):
         """
@@ -111,38 +419,103 @@ class AccurateMatrixSolver:
         Returns:
         - The largest (or smallest if inverse=True) eigenvalue
         """
-        A = np.linalg.inv(self.A) if inverse else self.A
-        x = np.random.rand(self.n)
-        x /= np.linalg.norm(x)
+        lu_piv = self.lu_factorization() if inverse else None
+        return power_method(self.A, inverse, max_iterations, tol, lu_piv)
+
+    def inverse_iteration(
+        self, shift=0.0, rayleigh=False, max_iterations=1000, tol=1e-10
+    ):
+        """
+        Find the eigenvalue closest to `shift` by shifted inverse iteration, optionally
+        with Rayleigh quotient shift updates. For shift 0 the cached LU is reused.
 
-        eigenvalue = None
-        for _ in range(max_iterations):
-            x_new = np.dot(A, x)
-            new_eigenvalue = np.dot(x_new, x) / np.dot(x, x)
-            x_new /= np.linalg.norm(x_new)
+        Returns:
+        - dict with "eigenvalue", "eigenvector", "iterations" and "converged".
+        """
+        lu_piv = self.lu_factorization() if shift == 0 else None
+        return inverse_iteration(
+            self.A, shift, rayleigh, max_iterations, tol, lu_piv=lu_piv
+        )
 
-            if np.linalg.norm(x_new - x) < tol:
-                eigenvalue = new_eigenvalue
-                break
-            x = x_new
+    def top_eigenpairs(self, k, method=None, X0=None, tol=1e-8):
+        """
+        Compute the k largest-magnitude eigenpairs without a full eigendecomposition.
 
-        return eigenvalue if eigenvalue else "Did not converge"
+        Args:
+        - k: Number of eigenpairs.
+        - method: "subspace" (block orthogonal iteration) or "arnoldi" (ARPACK
+          Lanczos/Arnoldi). Defaults to subspace for symmetric matrices, switching
+          to arnoldi if it does not converge, and to arnoldi otherwise: the ratios
+          of eigenvalue magnitudes decide the speed of subspace iteration, and
+          nonsymmetric spectra often have many nearly equal ones.
+        - X0: Optional warm-start block, e.g. top_basis() of a similar matrix.
+          Defaults to the subspace found by the previous call on this matrix.
+        - tol: Residual tolerance.
+
+        Returns:
+        - dict with "eigenvalues", "eigenvectors", "basis", "converged" and
+          "method" (the method that produced them).
+        """
+        if X0 is None:
+            X0 = self._top_basis
+        if X0 is not None and len(X0) != self.n:
+            X0 = None
+
+        default = method is None
+        if default:
+            method = "subspace" if self.structure()["symmetric"] else "arnoldi"
+        if method == "subspace":
+            result = subspace_iteration(self.A, k, X0, tol=tol)
+            if default and not result["converged"]:
+                # Nearly equal magnitudes (e.g. +lambda and -lambda) stall the
+                # block iteration; Lanczos from its subspace does not
+                X0, method = result["basis"][:, :k], "arnoldi"
+        if method == "arnoldi":
+            result = arnoldi_eigenpairs(self.A, k, X0, tol=tol)
+        elif method != "subspace":
+            raise ValueError("Invalid method. Must be 'subspace' or 'arnoldi'.")
+
+        result["method"] = method
+        self._top_basis = result["basis"]
+        return result
+
+    def top_basis(self):
+        """
+        The subspace found by the last top_eigenpairs call, or None.
+        """
+        return self._top_basis
 
     def solve_system(self, b):
         """
-        Solve the system of linear equations Ax = b using LU decomposition.
+        Solve the system of linear equations Ax = b along the path chosen by
+        structure(): a division for diagonal matrices, one substitution for
+        triangular ones, banded or dense Cholesky for SPD matrices, banded LU,
+        or the cached dense LU factors (O(n^2) per solve).
 
         Args:
-        - b: The right-hand side vector.
+        - b: The right-hand side vector (or an n x k matrix of right-hand sides).
 
         Returns:
         - The solution vector x.
         """
-        if self.L is None or self.U is None:
-            self.lu_decomposition()
-
-        y = np.linalg.solve(self.L, np.dot(self.P, b))
-        return np.linalg.solve(self.U, y)
+        structure = self.structure()
+        self.positive_definite()
+        path = structure["paths"]["solve"]
+        if path == "diagonal":
+            return (np.asarray(b, dtype=float).T / np.diag(self.A)).T
+        if path == "solve_triangular":
+            lower = structure["kind"] == "lower_triangular"
+            return solve_triangular(self.A, b, lower=lower, check_finite=False)
+        if path == "cho_solve_banded":
+            return cho_solve_banded((structure["cholesky"], False), b)
+        if path == "cho_solve":
+            return cho_solve(structure["cholesky"], b, check_finite=False)
+        if path == "solve_banded":
+            bands = (structure["lower_bandwidth"], structure["upper_bandwidth"])
+            if self._banded is None:
+                self._banded = banded_storage(self.A, *bands)
+            return solve_banded(bands, self._banded, b, check_finite=False)
+        return lu_factors.solve(self.lu_factorization(), b)
 
     def compare_eigenvalues(self):
         """
@@ -157,6 +530,31 @@ class AccurateMatrixSolver:
 
         return lu_eigenvalues, power_eigenvalue, inverse_power_eigenvalue
 
+    def solve_many(self, B):
+        """
+        Solve AX = B for k right-hand sides at once against the cached LU factors.
+
+        Args:
+        - B: n x k matrix whose columns are the right-hand sides.
+
+        Returns:
+        - (X, residual_norms): the n x k solutions and ||A x_j - b_j||_2 for each column.
+
+        Raises:
+        - np.linalg.LinAlgError: If the matrix is singular.
+        """
+        B = np.asarray(B, dtype=float)
+        if B.shape[0] != self.n:
+            raise ValueError(
+                f"Right-hand sides must have length {self.n}, got {B.shape[0]}"
+            )
+        if self.is_singular():
+            raise np.linalg.LinAlgError("Matrix is singular")
+
+        X = self.solve_system(B)
+        residual_norms = np.linalg.norm(self.A @ X - B, axis=0)
+        return X, residual_norms
+
     def solve_multiple_b(self):
         """
         Solve the linear systems Ax = b1 and Ax = b2.
@@ -167,22 +565,24 @@ class AccurateMatrixSolver:
         """
         results = {}
 
-        for i, b in enumerate([self.b1, self.b2], start=1):
-            if self.is_unique():
-                x = self.solve_system(b)
+        if self.is_unique():
+            X = self.solve_system(np.column_stack((self.b1, self.b2)))
+            for i in (1, 2):
                 results[f"Ax = b{i}"] = {
                     "type": "unique solution",
-                    "solution": x.tolist(),
+                    "solution": X[:, i - 1].tolist(),
                 }
+            return results
+
+        rank_A = np.linalg.matrix_rank(self.A)
+        for i, b in enumerate([self.b1, self.b2], start=1):
+            aug_A = np.column_stack((self.A, b))
+            rank_aug_A = np.linalg.matrix_rank(aug_A)
+
+            if rank_A == rank_aug_A:
+                results[f"Ax = b{i}"] = {"type": "infinite solutions"}
             else:
-                rank_A = np.linalg.matrix_rank(self.A)
-                aug_A = np.column_stack((self.A, b))
-                rank_aug_A = np.linalg.matrix_rank(aug_A)
-
-                if rank_A == rank_aug_A:
-                    results[f"Ax = b{i}"] = {"type": "infinite solutions"}
-                else:
-                    results[f"Ax = b{i}"] = {"type": "no solutions"}
+                results[f"Ax = b{i}"] = {"type": "no solutions"}
 
         return results
 
@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.linalg import hilbert, lu
+from scipy.linalg import hilbert, lu, lu_factor, lu_solve
 
 
 class AccurateMatrixSolver:
@@ -183,8 +183,10 @@ class AccurateMatrixSolver:
             if inverse:
                 if np.linalg.det(A_shifted) == 0:
                     return {"error": "Matrix is singular, cannot compute inverse."}
-                # We do not compute the inverse directly here. Instead, we apply the inverse power method to A_shifted.
+                # We do not compute the inverse directly here. Instead, A_shifted is
+                # factored once and every step is a pair of triangular solves.
                 A = A_shifted  # Use the shifted matrix directly
+                lu_piv = lu_factor(A_shifted)
             else:
                 A = A_shifted  # Normal power method, no inversion needed
 
@@ -197,7 +199,7 @@ class AccurateMatrixSolver:
 
             for iteration in range(max_iterations):
                 # If inverse is True, we apply A^-1 on the vector, else we apply A (normal power method)
-                x_new = np.dot(A, x) if not inverse else np.linalg.inv(A).dot(x)
+                x_new = np.dot(A, x) if not inverse else lu_solve(lu_piv, x)
 
                 new_eigenvalue = np.dot(x_new, x) / np.dot(x, x)
                 x_new /= np.linalg.norm(x_new)
@@ -0,0 +1,218 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+import numpy as np
+from scipy import sparse
+
+from app.services.matrix_solver import AccurateMatrixSolver
+from app.services.sparse_solver import SparseMatrixSolver
+
+
+def matrix_key(matrix_A, vector_b1, vector_b2):
+    """
+    Compute a content hash for an uploaded matrix and its two vectors.
+
+    Args:
+    - matrix_A: The coefficient matrix A, dense or scipy.sparse.
+    - vector_b1, vector_b2: The right-hand side vectors (None for sparse uploads
+      without right-hand sides).
+
+    Returns:
+    - A hex digest that only depends on the shapes and values of the inputs.
+    """
+    digest = hashlib.sha256()
+    arrays = [vector_b1, vector_b2]
+    if sparse.issparse(matrix_A):
+        # Hash the CSR arrays, never a dense copy
+        matrix_A = sparse.csr_matrix(matrix_A)
+        matrix_A.sum_duplicates()
+        digest.update(f"csr{matrix_A.shape}".encode())
+        arrays += [matrix_A.indptr, matrix_A.indices, matrix_A.data]
+    else:
+        arrays.append(matrix_A)
+    for array in arrays:
+        if array is None:
+            digest.update(b"None")
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def _make_solver(matrix_A, vector_b1, vector_b2):
+    if sparse.issparse(matrix_A):
+        return SparseMatrixSolver(matrix_A, vector_b1, vector_b2)
+    return AccurateMatrixSolver(matrix_A, vector_b1, vector_b2)
+
+
+class MatrixStore:
+    def __init__(self, max_entries=32, max_sessions=256, ttl=3600.0, spill_dir=None):
+        """
+        In-process store of uploaded matrices, addressed by a per-upload matrix ID.
+
+        Every upload opens a session identified by a random matrix ID. Sessions
+        point at solver objects keyed by the content hash of the matrix, so
+        identical uploads share one solver and its cached results (P/L/U,
+        eigenvalues, determinant, condition number).
+
+        Args:
+        - max_entries: Number of solvers kept in memory before the least recently used one is evicted.
+        - max_sessions: Number of live matrix IDs before the least recently used one is dropped.
+        - ttl: Seconds of inactivity after which a matrix ID expires.
+        - spill_dir: Optional directory where evicted matrices are written as .npz files and
+          reloaded from on the next access. Without it, evicting a matrix also drops
+          the sessions using it, so no live matrix ID points at a lost solver.
+        """
+        self.max_entries = max_entries
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.spill_dir = spill_dir
+        self._solvers = OrderedDict()  # content hash -> solver
+        self._sessions = OrderedDict()  # matrix ID -> [content hash, last access time]
+        self._refs = Counter()  # content hash -> number of sessions using it
+        self._lock = threading.Lock()
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def create_session(self, matrix_A, vector_b1, vector_b2):
+        """
+        Add a matrix to the store, reusing the cached solver if the same data was seen before.
+
+        Returns:
+        - A new matrix ID for the uploaded data.
+        """
+        key = matrix_key(matrix_A, vector_b1, vector_b2)
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            if key not in self._solvers:
+                self._solvers[key] = _make_solver(matrix_A, vector_b1, vector_b2)
+            self._solvers.move_to_end(key)
+
+            matrix_id = uuid.uuid4().hex
+            self._sessions[matrix_id] = [key, now]
+            self._refs[key] += 1
+
+            while len(self._sessions) > self.max_sessions:
+                self._drop_session(next(iter(self._sessions)))
+            self._evict_solvers()
+        return matrix_id
+
+    def get(self, matrix_id):
+        """
+        Look up the solver for a matrix ID and mark it as recently used.
+
+        Returns:
+        - The solver, or None if the matrix ID is unknown or has expired.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            session = self._sessions.get(matrix_id)
+            if session is None:
+                return None
+            session[1] = now
+            self._sessions.move_to_end(matrix_id)
+
+            key = session[0]
+            solver = self._solvers.get(key)
+            if solver is None:
+                solver = self._load_spilled(key)
+                if solver is None:
+                    self._drop_session(matrix_id)
+                    return None
+                self._solvers[key] = solver
+            self._solvers.move_to_end(key)
+            self._evict_solvers()
+            return solver
+
+    def clear(self):
+        with self._lock:
+            for matrix_id in list(self._sessions):
+                self._drop_session(matrix_id)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _expire(self, now):
+        # Sessions are kept in access order, so expired ones are at the front
+        while self._sessions:
+            matrix_id, (_, last_access) = next(iter(self._sessions.items()))
+            if now - last_access < self.ttl:
+                break
+            self._drop_session(matrix_id)
+
+    def _drop_session(self, matrix_id):
+        key, _ = self._sessions.pop(matrix_id)
+
+        self._refs[key] -= 1
+        if self._refs[key] > 0:
+            return
+        del self._refs[key]
+        self._solvers.pop(key, None)
+        if self.spill_dir is not None:
+            try:
+                os.remove(self._spill_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _evict_solvers(self):
+        while len(self._solvers) > self.max_entries:
+            key, solver = self._solvers.popitem(last=False)
+            if self._refs[key] == 0:
+                continue
+            if self.spill_dir is None:
+                stale = [m for m, (k, _) in self._sessions.items() if k == key]
+                for matrix_id in stale:
+                    self._drop_session(matrix_id)
+                continue
+            path = self._spill_path(key)
+            if not os.path.exists(path):
+                self._spill(path, solver)
+
+    def _load_spilled(self, key):
+        if self.spill_dir is None:
+            return None
+        try:
+            with np.load(self._spill_path(key)) as data:
+                # Empty arrays stand for missing right-hand sides
+                b1 = data["b1"] if data["b1"].size else None
+                b2 = data["b2"] if data["b2"].size else None
+                if "A" in data:
+                    return AccurateMatrixSolver(data["A"], b1, b2)
+                A = sparse.csr_matrix(
+                    (data["data"], data["indices"], data["indptr"]),
+                    shape=tuple(data["shape"]),
+                )
+                return SparseMatrixSolver(A, b1, b2)
+        except FileNotFoundError:
+            return None
+
+    def _spill(self, path, solver):
+        b1 = np.empty(0) if solver.b1 is None else solver.b1
+        b2 = np.empty(0) if solver.b2 is None else solver.b2
+        if isinstance(solver, SparseMatrixSolver):
+            A = solver.A
+            np.savez(
+                path,
+                data=A.data,
+                indices=A.indices,
+                indptr=A.indptr,
+                shape=A.shape,
+                b1=b1,
+                b2=b2,
+            )
+        else:
+            np.savez(path, A=solver.A, b1=b1, b2=b2)
+
+    def _spill_path(self, key):
+        return os.path.join(self.spill_dir, f"{key}.npz")
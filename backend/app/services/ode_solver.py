@@ -0,0 +1,359 @@
+import ast
+import math
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+
+ODE_METHODS = ("dopri5", "rosenbrock")
+MAX_EXPRESSION_LENGTH = 1000
+
+# Names a right-hand side expression may call or reference besides t, the state
+# variables and the user's parameters
+ALLOWED_FUNCTIONS = {
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "arcsin": np.arcsin,
+    "arccos": np.arccos,
+    "arctan": np.arctan,
+    "sinh": np.sinh,
+    "cosh": np.cosh,
+    "tanh": np.tanh,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+    "abs": np.abs,
+    "sign": np.sign,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+}
+ALLOWED_CONSTANTS = {"pi": math.pi, "e": math.e}
+_ALLOWED_NODES = (
+    ast.Expression,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Call,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.Pow,
+    ast.Mod,
+    ast.UAdd,
+    ast.USub,
+)
+
+# Dormand-Prince 5(4) tableau; B is the 5th-order solution (also the last row of
+# A, so the final stage is the first stage of the next step) and E = B - B*
+# the difference to the embedded 4th-order solution
+DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+DP_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0])
+DP_E = np.array(
+    [
+        71 / 57600,
+        0,
+        -71 / 16695,
+        71 / 1920,
+        -17253 / 339200,
+        22 / 525,
+        -1 / 40,
+    ]
+)
+
+# Step size control
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+class _FloatConstants(ast.NodeTransformer):
+    # Integer literals would make e.g. 9**9**9 an exact (and endless) integer power
+    def visit_Constant(self, node):
+        try:
+            value = float(node.value)
+        except OverflowError:
+            value = math.inf
+        # Float literals such as 1e999 parse to inf instead of overflowing
+        if not math.isfinite(value):
+            raise ValueError("Number literals must be within the float64 range")
+        return ast.copy_location(ast.Constant(value), node)
+
+
+def compile_rhs(expressions, variables, parameters=None):
+    """
+    Build f(t, y) for the system y_i' = expressions[i] from user-supplied text.
+
+    Expressions are parsed with ast and may only contain numbers, + - * / ** %,
+    calls to ALLOWED_FUNCTIONS, ALLOWED_CONSTANTS, "t", the state variable names
+    and the parameter names; anything else (attributes, subscripts, keywords,
+    comprehensions, ...) is rejected before evaluation. Number literals are
+    evaluated as floats.
+
+    Args:
+    - expressions: One expression per state variable.
+    - variables: Names of the state variables, in the order of y.
+    - parameters: dict of extra named constants, e.g. {"P": 2.0}.
+
+    Returns:
+    - f(t, y) returning a float array of len(variables).
+
+    Raises:
+    - ValueError: For invalid names, disallowed syntax or numbers beyond the
+      float64 range.
+    """
+    parameters = dict(parameters or {})
+    if len(expressions) != len(variables):
+        raise ValueError("Give exactly one expression per state variable")
+    names = ["t", *variables, *parameters]
+    for name in names:
+        if not name.isidentifier() or name.startswith("_"):
+            raise ValueError(f"Invalid name: {name!r}")
+    if len(set(names)) != len(names):
+        raise ValueError(
+            "Variable and parameter names must be distinct from t and each other"
+        )
+    reserved = set(names) & (set(ALLOWED_FUNCTIONS) | set(ALLOWED_CONSTANTS))
+    if reserved:
+        raise ValueError(f"Reserved names: {', '.join(sorted(reserved))}")
+
+    namespace = {**ALLOWED_FUNCTIONS, **ALLOWED_CONSTANTS}
+    for name, value in parameters.items():
+        try:
+            value = float(value)
+        except OverflowError:
+            value = math.inf
+        if not math.isfinite(value):
+            raise ValueError("Parameters must be finite and within the float64 range")
+        namespace[name] = value
+    known = set(namespace) | {"t", *variables}
+
+    compiled = []
+    for expression in expressions:
+        if not isinstance(expression, str) or len(expression) > MAX_EXPRESSION_LENGTH:
+            raise ValueError(
+                "Expressions must be strings of at most "
+                f"{MAX_EXPRESSION_LENGTH} characters"
+            )
+        try:
+            tree = ast.parse(expression, mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression {expression!r}: {e.msg}")
+        for node in ast.walk(tree):
+            if not isinstance(node, _ALLOWED_NODES):
+                raise ValueError(
+                    f"Disallowed syntax in {expression!r}: {type(node).__name__}"
+                )
+            if isinstance(node, ast.Constant) and (
+                isinstance(node.value, bool)
+                or not isinstance(node.value, (int, float))
+            ):
+                raise ValueError(
+                    f"Only numeric constants are allowed in {expression!r}"
+                )
+            if isinstance(node, ast.Name) and node.id not in known:
+                raise ValueError(f"Unknown name {node.id!r} in {expression!r}")
+            if isinstance(node, ast.Call) and (
+                not isinstance(node.func, ast.Name)
+                or node.func.id not in ALLOWED_FUNCTIONS
+                or node.keywords
+            ):
+                raise ValueError(
+                    "Only positional calls to "
+                    f"{', '.join(ALLOWED_FUNCTIONS)} are allowed"
+                )
+        tree = ast.fix_missing_locations(_FloatConstants().visit(tree))
+        compiled.append(compile(tree, "<rhs>", "eval"))
+
+    globals_ = {"__builtins__": {}, **namespace}
+
+    def f(t, y):
+        scope = {"t": t, **dict(zip(variables, y))}
+        try:
+            values = [eval(code, globals_, scope) for code in compiled]
+            return np.array(values, dtype=float)
+        except (OverflowError, ZeroDivisionError, TypeError, ValueError) as e:
+            raise ValueError(f"Could not evaluate the right-hand side at t={t}: {e}")
+
+    return f
+
+
+def _rms(x):
+    return float(np.sqrt(np.mean(np.square(x)))) if len(x) else 0.0
+
+
+def _initial_step(f, t0, y0, f0, order, rtol, atol, span):
+    # Hairer, Norsett & Wanner's starting step heuristic
+    scale = atol + rtol * np.abs(y0)
+    d0, d1 = _rms(y0 / scale), _rms(f0 / scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    h0 = min(h0, span)
+    d2 = _rms((f(t0 + h0, y0 + h0 * f0) - f0) / scale) / h0
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0 * 1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2)) ** (1 / (order + 1))
+    return min(100 * h0, h1, span)
+
+
+def _dopri5_step(f, t, y, h, k1):
+    K = np.empty((7, len(y)))
+    K[0] = k1
+    for stage in range(1, 7):
+        increment = np.dot(DP_A[stage], K[:stage])
+        K[stage] = f(t + DP_C[stage] * h, y + h * increment)
+    y_new = y + h * (DP_B @ K)
+    return y_new, h * (DP_E @ K), K[6], 6
+
+
+def _jacobian(f, t, y, fy):
+    # Forward differences, one column per state variable
+    J = np.empty((len(y), len(y)))
+    for j in range(len(y)):
+        delta = math.sqrt(np.finfo(float).eps) * max(1.0, abs(y[j]))
+        y_shifted = y.copy()
+        y_shifted[j] += delta
+        J[:, j] = (f(t, y_shifted) - fy) / delta
+    return J
+
+
+def _rosenbrock_step(f, t, y, h, f0):
+    """
+    One step of the L-stable Rosenbrock method of Shampine and Reichelt (the
+    scheme behind MATLAB's ode23s): order 2 with an order 3 error estimate, one
+    LU factorization of W = I - h d J and three linear solves per step.
+    """
+    d = 1 / (2 + math.sqrt(2))
+    e32 = 6 + math.sqrt(2)
+    n = len(y)
+    J = _jacobian(f, t, y, f0)
+    delta = math.sqrt(np.finfo(float).eps) * max(1.0, abs(t))
+    T = (f(t + delta, y) - f0) / delta  # df/dt for non-autonomous systems
+    W = lu_factor(np.eye(n) - h * d * J, check_finite=False)
+
+    def solve(b):
+        # An overflowing trial step gives NaNs here, rejected by the error test
+        return lu_solve(W, b, check_finite=False)
+
+    k1 = solve(f0 + h * d * T)
+    f1 = f(t + h / 2, y + h / 2 * k1)
+    k2 = solve(f1 - k1) + k1
+    y_new = y + h * k2
+    f2 = f(t + h, y_new)
+    k3 = solve(f2 - e32 * (k2 - f1) - 2 * (k1 - f0) + h * d * T)
+    error = h / 6 * (k1 - 2 * k2 + k3)
+    # n evaluations for J, one for df/dt, f1 and f2 (f2 is the next step's f0)
+    return y_new, error, f2, n + 3
+
+
+def integrate_ode(
+    f, t_span, y0, method="dopri5", rtol=1e-6, atol=1e-9, max_steps=100000
+):
+    """
+    Integrate y' = f(t, y) with adaptive step size control.
+
+    Each step is accepted when the embedded error estimate, scaled componentwise
+    by atol + rtol * |y|, has RMS norm <= 1; the next step size is
+    h * min(MAX_FACTOR, max(MIN_FACTOR, SAFETY * err^(-1 / (order + 1)))), never
+    growing right after a rejection. Smooth stretches therefore take few large
+    steps and only difficult regions are resolved finely.
+
+    Args:
+    - f: Right-hand side f(t, y) returning an array like y.
+    - t_span: (t0, t_end) with t_end > t0.
+    - y0: Initial state.
+    - method: "dopri5" (explicit Dormand-Prince 5(4), 6 evaluations per step
+      thanks to first-same-as-last) or "rosenbrock" (linearly implicit, L-stable
+      order 2(3), for stiff systems where explicit methods need tiny steps).
+    - rtol, atol: Relative and absolute tolerances.
+    - max_steps: Limit on attempted steps.
+
+    Returns:
+    - dict with "t" and "y" (accepted points, y of shape (len(t), len(y0))),
+      "success", "message", "nfev", "accepted" and "rejected".
+    """
+    if method not in ODE_METHODS:
+        raise ValueError(f"Invalid method. Must be one of {', '.join(ODE_METHODS)}.")
+    t0, t_end = (float(t) for t in t_span)
+    if not t_end > t0:
+        raise ValueError("t_span must satisfy t_end > t0")
+    if rtol <= 0 or atol < 0:
+        raise ValueError("Tolerances must be rtol > 0 and atol >= 0")
+    y = np.atleast_1d(np.asarray(y0, dtype=float))
+    step, order = (_dopri5_step, 4) if method == "dopri5" else (_rosenbrock_step, 2)
+    with np.errstate(all="ignore"):
+        return _integrate(f, step, order, t0, t_end, y, rtol, atol, max_steps)
+
+
+def _integrate(f, step, order, t0, t_end, y, rtol, atol, max_steps):
+    # Overflow shows up as a non-finite error estimate and is handled as a rejection
+    f_current = f(t0, y)
+    nfev = 1
+    h = _initial_step(f, t0, y, f_current, order, rtol, atol, t_end - t0)
+    nfev += 1
+    if not np.isfinite(h) or h <= 0:
+        h = 1e-6 * (t_end - t0)
+    t = t0
+    times, states = [t0], [y.copy()]
+    accepted = rejected = 0
+    rejected_last = False
+    message = "Reached the end of the interval"
+    success = True
+
+    while t < t_end:
+        if accepted + rejected >= max_steps:
+            success, message = False, f"Exceeded max_steps={max_steps}"
+            break
+        h = min(h, t_end - t)
+        if h <= 10 * np.finfo(float).eps * max(1.0, abs(t)):
+            success, message = False, f"Step size became too small at t={t}"
+            break
+
+        y_new, error, f_new, evaluations = step(f, t, y, h, f_current)
+        nfev += evaluations
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err = _rms(error / scale)
+        if not np.isfinite(err) or not np.all(np.isfinite(y_new)):
+            # Treat overflow like a failed error test and retry with a smaller step
+            err = np.inf
+
+        if err <= 1:
+            t = t + h if t_end - t > h else t_end
+            y, f_current = y_new, f_new
+            times.append(t)
+            states.append(y.copy())
+            accepted += 1
+            factor = MAX_FACTOR if err == 0 else SAFETY * err ** (-1 / (order + 1))
+            factor = min(MAX_FACTOR, factor)
+            if rejected_last:
+                factor = min(1.0, factor)
+            rejected_last = False
+        else:
+            rejected += 1
+            rejected_last = True
+            factor = MIN_FACTOR
+            if np.isfinite(err):
+                factor = max(MIN_FACTOR, SAFETY * err ** (-1 / (order + 1)))
+        h *= factor
+
+    return {
+        "t": np.array(times),
+        "y": np.array(states),
+        "success": success,
+        "message": message,
+        "nfev": nfev,
+        "accepted": accepted,
+        "rejected": rejected,
+    }
@@ -0,0 +1,222 @@
+import numpy as np
+from scipy.optimize import brentq
+
+from app.services.integrators import integrate_second_order
+
+SHOOTING_MODES = ("auto", "superposition", "newton", "secant")
+
+
+def finite_difference_partials(f, delta=1e-6):
+    """
+    (df/du, df/dv) of f(y, u, v) by central differences, for the variational
+    equation when no analytic partial derivatives are given.
+    """
+
+    def partials(y, u, v):
+        du = delta * np.maximum(1.0, np.abs(u))
+        dv = delta * np.maximum(1.0, np.abs(v))
+        return (
+            (f(y, u + du, v) - f(y, u - du, v)) / (2 * du),
+            (f(y, u, v + dv) - f(y, u, v - dv)) / (2 * dv),
+        )
+
+    return partials
+
+
+def is_linear(f, y, samples=4, rtol=1e-8, seed=0):
+    """
+    Check numerically whether f(y, u, v) is affine in (u, v), i.e. u'' = f is a
+    linear ODE: f must satisfy f(t X1 + (1 - t) X2) = t f(X1) + (1 - t) f(X2) at
+    random states, for an interpolating and an extrapolating t.
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.choice(np.asarray(y, dtype=float), size=samples)
+    u1, v1, u2, v2 = rng.uniform(-10.0, 10.0, size=(4, samples))
+    f1 = np.broadcast_to(f(points, u1, v1), (samples,))
+    f2 = np.broadcast_to(f(points, u2, v2), (samples,))
+    scale = np.maximum(np.abs(f1), np.abs(f2)) + 1.0
+    for t in (0.3, 2.5):
+        mixed = f(points, t * u1 + (1 - t) * u2, t * v1 + (1 - t) * v2)
+        error = np.abs(mixed - (t * f1 + (1 - t) * f2))
+        if np.any(error > 10 * rtol * abs(t) * scale):
+            return False
+    return True
+
+
+def shoot(
+    f,
+    y,
+    alpha,
+    beta,
+    integrator="explicit",
+    mode="auto",
+    partials=None,
+    slope_guess=0.0,
+    tol=1e-10,
+    max_iterations=50,
+    state_independent=False,
+):
+    """
+    Solve the boundary value problem u'' = f(y, u, u'), u(y_0) = alpha,
+    u(y_end) = beta by shooting on the initial slope s = u'(y_0).
+
+    - "superposition" (linear ODEs): u(y_end; s) is affine in s, and so is its
+      discretization, so two integrations (s = 0 and s = 1, run together as one
+      batch) give the exact slope and the solution as their combination.
+    - "newton": Newton's method on F(s) = u(y_end; s) - beta, with F'(s) from the
+      variational equation w'' = f_u w + f_v w', w(y_0) = 0, w'(y_0) = 1,
+      integrated together with u (one integration per iteration).
+    - "secant": the secant method on F, without the variational equation.
+    - "auto": superposition if f is detected as linear (see is_linear), else newton.
+    Newton and secant steps are kept inside any bracket [s_-, s_+] with a sign
+    change of F found so far (bisecting otherwise). If they do not converge, a
+    bracket is grown geometrically around the best slope and refined by Brent's
+    method, so no initial bracket has to be guessed.
+
+    Args:
+    - f: Vectorized right-hand side f(y, u, v).
+    - y: Grid, from the left to the right boundary.
+    - alpha, beta: Boundary values.
+    - integrator: "explicit" (Euler), "implicit" (semi-implicit Euler) or "rk4".
+    - mode: See above.
+    - partials: Function returning (f_u, f_v); finite differences by default.
+    - slope_guess: Starting slope for newton / secant.
+    - tol: Tolerance on |u(y_end) - beta|, relative to max(1, |beta|).
+    - max_iterations: Iteration limit for newton / secant.
+    - state_independent: f depends on y alone (u'' = g(y)), so the Euler
+      integrations of f need no step loop; see integrate_second_order.
+
+    Returns:
+    - dict with "u", "v" (the solution on y), "slope", "mode" (the mode used),
+      "integrations" (number of IVP integrations) and "converged".
+
+    Raises:
+    - ValueError: If no bracket is found, or the solution blows up (a non-finite
+      u(y_end)) at a slope the bracket search or Brent's method needs.
+    """
+    if mode not in SHOOTING_MODES:
+        raise ValueError(f"Invalid mode. Must be one of {', '.join(SHOOTING_MODES)}.")
+    y = np.asarray(y, dtype=float)
+    if mode == "auto":
+        mode = "superposition" if is_linear(f, y) else "newton"
+
+    if mode == "superposition":
+        u, v = integrate_second_order(
+            f, y, alpha, np.array([0.0, 1.0]), integrator, state_independent
+        )
+        slope = (beta - u[0, -1]) / (u[1, -1] - u[0, -1])
+        return {
+            "u": u[0] + slope * (u[1] - u[0]),
+            "v": v[0] + slope * (v[1] - v[0]),
+            "slope": float(slope),
+            "mode": mode,
+            "integrations": 2,
+            "converged": bool(np.isfinite(slope)),
+        }
+
+    if partials is None:
+        partials = finite_difference_partials(f)
+
+    def variational(t, x, dx):
+        # x = (u, w), dx = (u', w'): the ODE and its derivative with respect to s
+        f_u, f_v = partials(t, x[0], dx[0])
+        # "+ 0 * x[0]" broadcasts right-hand sides that do not depend on u
+        return np.stack((f(t, x[0], dx[0]) + 0 * x[0], f_u * x[1] + f_v * dx[1]))
+
+    integrations = 0
+    scale = max(1.0, abs(beta))
+    bracket = {}  # sign of F -> slope
+
+    def evaluate(s, with_derivative):
+        # Trial slopes may blow up; a non-finite F is handled by the caller
+        nonlocal integrations
+        integrations += 1
+        with np.errstate(over="ignore", invalid="ignore"):
+            if with_derivative:
+                x, dx = integrate_second_order(
+                    variational,
+                    y,
+                    np.array([alpha, 0.0]),
+                    np.array([s, 1.0]),
+                    integrator,
+                )
+                return x[0], dx[0], x[0, -1] - beta, x[1, -1]
+            u, v = integrate_second_order(
+                f, y, alpha, s, integrator, state_independent
+            )
+        return u, v, u[-1] - beta, None
+
+    def residual(s):
+        # Brent's method needs finite values of F on the whole bracket
+        F = evaluate(s, False)[2]
+        if not np.isfinite(F):
+            raise ValueError(
+                f"Shooting failed: the solution blows up for the initial slope {s}"
+            )
+        return F
+
+    s, previous = float(slope_guess), None
+    best = None
+    for _ in range(max_iterations):
+        u, v, F, dF = evaluate(s, mode == "newton")
+        if not np.isfinite(F):
+            break
+        if best is None or abs(F) < abs(best[2]):
+            best = (u, v, F, s)
+        if abs(F) <= tol * scale:
+            return {
+                "u": u,
+                "v": v,
+                "slope": s,
+                "mode": mode,
+                "integrations": integrations,
+                "converged": True,
+            }
+        bracket[F > 0] = s
+
+        if mode == "secant":
+            if previous is None:
+                step = -F  # Any nonzero first step; the secant takes over from here
+            else:
+                s_old, F_old = previous
+                step = -F * (s - s_old) / (F - F_old) if F != F_old else np.nan
+            previous = (s, F)
+        else:
+            step = -F / dF if dF else np.nan
+
+        s_next = s + step
+        if len(bracket) == 2:
+            low, high = sorted(bracket.values())
+            if not low < s_next < high:
+                s_next = (low + high) / 2
+        elif not np.isfinite(s_next):
+            break
+        s = float(s_next)
+
+    # Grow a bracket around the best slope so far and refine it with Brent's method
+    center = best[3] if best is not None else float(slope_guess)
+    if len(bracket) == 2:
+        low, high = sorted(bracket.values())
+    else:
+        width = 1.0
+        for _ in range(60):
+            low, high = center - width, center + width
+            F_low, F_high = residual(low), residual(high)
+            if np.sign(F_low) != np.sign(F_high):
+                break
+            width *= 2
+        else:
+            raise ValueError(
+                "Shooting failed: no initial slope brackets the boundary value"
+            )
+
+    slope = brentq(residual, low, high, xtol=1e-14, maxiter=200)
+    u, v, F, _ = evaluate(slope, False)
+    return {
+        "u": u,
+        "v": v,
+        "slope": float(slope),
+        "mode": mode,
+        "integrations": integrations,
+        "converged": bool(abs(F) <= tol * scale),
+    }
@@ -0,0 +1,320 @@
+import numpy as np
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, onenormest, splu
+
+from app.services.eigen_iteration import (
+    arnoldi_eigenpairs,
+    inverse_iteration,
+    subspace_iteration,
+)
+from app.services.hilbert_reference import hilbert_condition
+from app.services.structure import is_symmetric
+
+
+def _permutation_sign(perm):
+    # The parity of a permutation is n minus its number of cycles
+    visited = np.zeros(len(perm), dtype=bool)
+    cycles = 0
+    for start in range(len(perm)):
+        if not visited[start]:
+            cycles += 1
+            i = start
+            while not visited[i]:
+                visited[i] = True
+                i = perm[i]
+    return -1.0 if (len(perm) - cycles) % 2 else 1.0
+
+
+class SparseMatrixSolver:
+    def __init__(self, matrix, b1=None, b2=None):
+        """
+        Solver for large sparse matrices, kept in CSR format and never densified.
+
+        Solves go through one cached SuperLU factorization, eigenvalues through
+        ARPACK or block subspace iteration, and the condition number through a
+        1-norm estimate of the inverse.
+
+        Args:
+        - matrix: The coefficient matrix A, a scipy.sparse matrix.
+        - b1, b2: Optional right-hand side vectors for Ax = b1, Ax = b2.
+        """
+        self.A = sparse.csr_matrix(matrix, dtype=float)
+        self.b1 = None if b1 is None else np.asarray(b1, dtype=float)
+        self.b2 = None if b2 is None else np.asarray(b2, dtype=float)
+        self.n = self.A.shape[0]
+        self._lu = None  # SuperLU factors of A
+        self._singular = None  # True when SuperLU found an exactly zero pivot
+        self._condition_number = None  # Cached 1-norm condition estimate
+        self._top_basis = None  # Last subspace from top_eigenpairs, for warm starts
+
+    def structure_report(self):
+        """
+        Symmetry and bandwidth of the sparse matrix and the routines used for it.
+        """
+        rows, cols = self.A.nonzero()
+        offsets = cols - rows
+        return {
+            "kind": "sparse",
+            "symmetric": is_symmetric(self.A),
+            "lower_bandwidth": int(max(0, -offsets.min())) if len(offsets) else 0,
+            "upper_bandwidth": int(max(0, offsets.max())) if len(offsets) else 0,
+            "nnz": int(self.A.nnz),
+            "paths": {
+                "solve": "splu",
+                "eigenvalues": "arpack",
+                "condition": "onenormest",
+            },
+        }
+
+    def lu_factorization(self):
+        """
+        Factor A once with SuperLU (column ordering COLAMD, partial pivoting).
+
+        Returns:
+        - The SuperLU object, or None if the matrix is exactly singular.
+        """
+        if self._singular is None:
+            try:
+                self._lu = splu(self.A.tocsc())
+                self._singular = False
+            except RuntimeError:
+                self._singular = True
+        return self._lu
+
+    def is_singular(self):
+        """
+        Check whether SuperLU hit an exactly zero pivot, or a pivot negligible
+        relative to the largest one.
+        """
+        rank = self.rank()
+        return rank is None or rank < self.n
+
+    def is_unique(self):
+        """
+        Check if Ax = b has a unique solution, i.e. A has full numerical rank.
+        """
+        return not self.is_singular()
+
+    def rank(self):
+        """
+        Estimate the numerical rank from the pivots of U, like lu_factors.rank.
+
+        Returns:
+        - The rank estimate, or None if the factorization broke down on an exactly
+          singular matrix (the rank is then unknown but below n).
+        """
+        lu = self.lu_factorization()
+        if lu is None:
+            return None
+        pivots = np.abs(lu.U.diagonal())
+        tol = self.n * np.finfo(float).eps * (pivots.max() if self.n else 0)
+        return int(np.count_nonzero(pivots > tol))
+
+    def log_determinant(self):
+        """
+        Sign and log of |det(A)| from the SuperLU factors, Pr A Pc = L U with
+        unit-diagonal L.
+
+        Returns:
+        - (sign, logabsdet), with sign 0 and logabsdet -inf for a singular matrix.
+        """
+        lu = self.lu_factorization()
+        if lu is None:
+            return 0.0, -np.inf
+        diag = lu.U.diagonal()
+        if np.any(diag == 0):
+            return 0.0, -np.inf
+        sign = _permutation_sign(lu.perm_r) * _permutation_sign(lu.perm_c)
+        sign *= (-1.0) ** np.count_nonzero(diag < 0)
+        return sign, float(np.sum(np.log(np.abs(diag))))
+
+    def determinant(self):
+        """
+        det(A) from the SuperLU factors, +/-inf if it overflows.
+        """
+        sign, logabsdet = self.log_determinant()
+        with np.errstate(over="ignore"):
+            return sign * np.exp(logabsdet)
+
+    def condition_number(self):
+        """
+        Estimate the 1-norm condition number ||A||_1 ||A^-1||_1 without forming
+        A^-1: ||A^-1||_1 is estimated by Higham's block algorithm (onenormest),
+        applying A^-1 and A^-T through the SuperLU factors.
+        The result is cached after the first call.
+
+        Returns:
+        - The condition number estimate, inf if the matrix is singular.
+        """
+        if self._condition_number is None:
+            lu = self.lu_factorization()
+            if lu is None:
+                self._condition_number = np.inf
+            else:
+                inverse = LinearOperator(
+                    self.A.shape,
+                    matvec=lu.solve,
+                    rmatvec=lambda x: lu.solve(x, trans="T"),
+                    dtype=float,
+                )
+                norm_A = abs(self.A).sum(axis=0).max()
+                self._condition_number = norm_A * onenormest(inverse)
+        return self._condition_number
+
+    def compare_with_hilbert(self, method="estimate"):
+        """
+        Compare the 1-norm condition number estimate with the 1-norm condition
+        number of a Hilbert matrix of the same size. Only the estimate is
+        available; an exact condition number
+        would need the singular values of the densified matrix.
+
+        Returns:
+        - The condition number of the matrix and the condition number of the Hilbert matrix.
+        """
+        if method != "estimate":
+            raise ValueError(
+                "Only method=estimate is available for sparse matrices; the exact "
+                "condition number needs a dense SVD"
+            )
+        return self.condition_number(), hilbert_condition(self.n, "1")
+
+    def eigenvalues(self, k=6):
+        """
+        The k largest-magnitude eigenvalues by ARPACK (Lanczos for symmetric A,
+        Arnoldi otherwise). The matrix is never densified.
+
+        Returns:
+        - The eigenvalues, largest magnitude first.
+
+        Raises:
+        - ValueError: Unless 1 <= k < n - 1, which ARPACK needs.
+        """
+        if not 1 <= k < self.n - 1:
+            raise ValueError(
+                f"k must be between 1 and {self.n - 2} for a sparse {self.n} x "
+                f"{self.n} matrix"
+            )
+        values = arnoldi_eigenpairs(self.A, k)["eigenvalues"]
+        if np.iscomplexobj(values) and not values.imag.any():
+            values = values.real
+        return values
+
+    def polynomial_equation(self, method="auto", dps=50):
+        raise ValueError(
+            "The characteristic polynomial needs the full spectrum and is not "
+            "available for sparse matrices"
+        )
+
+    def analysis(self):
+        raise ValueError(
+            "process-all needs the full spectrum and is not available for sparse "
+            "matrices; use the individual endpoints instead"
+        )
+
+    def power_method(self, inverse=False, max_iterations=1000, tol=1e-3):
+        """
+        The dominant eigenvalue of A, or of A^-1 if inverse=True.
+        The inverse variant runs inverse iteration on the cached SuperLU factors.
+
+        Returns:
+        - The eigenvalue estimate, or "Did not converge".
+        """
+        if not inverse:
+            return self.eigenvalues(1)[0]
+
+        if self.is_singular():
+            raise np.linalg.LinAlgError("Singular matrix")
+        result = inverse_iteration(
+            self.A,
+            max_iterations=max_iterations,
+            tol=tol,
+            lu_piv=self.lu_factorization(),
+        )
+        if not result["converged"]:
+            return "Did not converge"
+        return 1.0 / result["eigenvalue"]
+
+    def inverse_iteration(
+        self, shift=0.0, rayleigh=False, max_iterations=1000, tol=1e-10
+    ):
+        """
+        Find the eigenvalue closest to `shift` by shifted inverse iteration on
+        sparse LU factors. For shift 0 the cached factorization is reused.
+
+        Returns:
+        - dict with "eigenvalue", "eigenvector", "iterations" and "converged".
+        """
+        lu = self.lu_factorization() if shift == 0 and not self._singular else None
+        return inverse_iteration(
+            self.A, shift, rayleigh, max_iterations, tol, lu_piv=lu
+        )
+
+    def top_eigenpairs(self, k, method=None, X0=None, tol=1e-8):
+        """
+        Compute the k largest-magnitude eigenpairs, see
+        AccurateMatrixSolver.top_eigenpairs. Both methods only use sparse products.
+        """
+        if X0 is None:
+            X0 = self._top_basis
+        if X0 is not None and len(X0) != self.n:
+            X0 = None
+
+        if method is None:
+            method = "arnoldi"
+        if method == "subspace":
+            result = subspace_iteration(self.A, k, X0, tol=tol)
+        elif method == "arnoldi":
+            result = arnoldi_eigenpairs(self.A, k, X0, tol=tol)
+        else:
+            raise ValueError("Invalid method. Must be 'subspace' or 'arnoldi'.")
+
+        result["method"] = method
+        self._top_basis = result["basis"]
+        return result
+
+    def top_basis(self):
+        return self._top_basis
+
+    def solve_many(self, B):
+        """
+        Solve AX = B for k right-hand sides against the cached SuperLU factors.
+
+        Args:
+        - B: n x k matrix whose columns are the right-hand sides.
+
+        Returns:
+        - (X, residual_norms): the n x k solutions and ||A x_j - b_j||_2 for each column.
+
+        Raises:
+        - np.linalg.LinAlgError: If the matrix is singular.
+        """
+        B = np.asarray(B, dtype=float)
+        if B.shape[0] != self.n:
+            raise ValueError(
+                f"Right-hand sides must have length {self.n}, got {B.shape[0]}"
+            )
+        if self.is_singular():
+            raise np.linalg.LinAlgError("Matrix is singular")
+
+        X = self.lu_factorization().solve(B)
+        residual_norms = np.linalg.norm(self.A @ X - B, axis=0)
+        return X, residual_norms
+
+    def solve_multiple_b(self):
+        """
+        Solve Ax = b1 and Ax = b2 with one sparse factorization.
+
+        Raises:
+        - ValueError: If no right-hand sides were uploaded with the matrix.
+        - np.linalg.LinAlgError: If the matrix is singular. Telling infinitely
+          many solutions from none needs a rank-revealing factorization that
+          sparse LU does not provide.
+        """
+        if self.b1 is None or self.b2 is None:
+            raise ValueError("No right-hand side vectors were uploaded with this matrix")
+
+        X, _ = self.solve_many(np.column_stack((self.b1, self.b2)))
+        return {
+            f"Ax = b{i}": {"type": "unique solution", "solution": X[:, i - 1].tolist()}
+            for i in (1, 2)
+        }
@@ -0,0 +1,178 @@
+import numpy as np
+from scipy import sparse
+from scipy.linalg import LinAlgError, cho_factor, cholesky_banded
+
+# A matrix counts as banded when its total bandwidth is below this fraction of n;
+# beyond that, banded storage is no cheaper than a dense factorization
+BANDED_FRACTION = 0.25
+# Rows of a dense matrix scanned at a time, so the checks never allocate more
+# than a few blocks of this many rows
+BLOCK_ROWS = 256
+
+
+def is_symmetric(A):
+    """
+    Check A == A^T up to a tolerance relative to max|a_ij|. Works for dense and
+    scipy.sparse matrices. Dense matrices are compared one block of rows at a
+    time, stopping at the first asymmetric block.
+    """
+    n = A.shape[0]
+    if n == 0:
+        return True
+    if sparse.issparse(A):
+        return bool(abs(A - A.T).max() <= 1e-12 * max(abs(A).max(), 1.0))
+
+    tol = 1e-12 * max(A.max(), -A.min(), 1.0)
+    for start in range(0, n, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, n)
+        # Only the blocks on and right of the diagonal; the mirror image covers the rest
+        if np.abs(A[start:stop, start:] - A[start:, start:stop].T).max() > tol:
+            return False
+    return True
+
+
+def bandwidths(A):
+    """
+    Lower and upper bandwidth of a dense matrix: the largest i - j and j - i over
+    its nonzero entries. Rows are scanned one block at a time for their first and
+    last nonzero column, stopping once both bandwidths are n - 1.
+    """
+    n = len(A)
+    lower = upper = 0
+    for start in range(0, n, BLOCK_ROWS):
+        nonzero = A[start : start + BLOCK_ROWS] != 0
+        rows = np.flatnonzero(nonzero.any(axis=1))
+        if len(rows) == 0:
+            continue
+        first = nonzero[rows].argmax(axis=1)
+        last = n - 1 - nonzero[rows, ::-1].argmax(axis=1)
+        rows += start
+        lower = max(lower, int((rows - first).max()))
+        upper = max(upper, int((last - rows).max()))
+        if lower == upper == n - 1:
+            break
+    return lower, upper
+
+
+def banded_storage(A, lower, upper):
+    """
+    Pack a dense banded matrix into the (lower + upper + 1) x n diagonal-ordered
+    form used by scipy.linalg.solve_banded (row upper + i - j holds a_ij).
+    """
+    n = len(A)
+    ab = np.zeros((lower + upper + 1, n))
+    for offset in range(-lower, upper + 1):
+        if offset >= 0:
+            ab[upper - offset, offset:] = np.diagonal(A, offset)
+        else:
+            ab[upper - offset, : n + offset] = np.diagonal(A, offset)
+    return ab
+
+
+def detect_structure(A):
+    """
+    Classify a dense square matrix so the solver can use a specialised routine.
+
+    Symmetry is tested with a tolerance relative to max|a_ij|; triangularity
+    and bandwidth use exact zeros. Positive definiteness of a symmetric matrix
+    with a positive diagonal is left open ("positive_definite" is None) until a
+    solve, determinant or condition estimate needs it, see factor_cholesky.
+
+    Args:
+    - A: Square float matrix.
+
+    Returns:
+    - dict with:
+      - "kind": "diagonal", "lower_triangular", "upper_triangular", "banded",
+        "spd", "symmetric" or "general".
+      - "symmetric", "positive_definite" (True, False or None while undecided),
+        "lower_bandwidth", "upper_bandwidth".
+      - "cholesky": the Cholesky factor of an SPD matrix once factor_cholesky has
+        run (upper banded storage for banded matrices, a cho_factor pair
+        otherwise), else None.
+      - "paths": the routine used for "solve", "eigenvalues" and "condition".
+    """
+    n = len(A)
+    lower, upper = bandwidths(A)
+    symmetric = is_symmetric(A)
+    positive_diagonal = n > 0 and bool(np.all(np.diag(A) > 0))
+    positive_definite = False
+
+    if lower == 0 and upper == 0:
+        kind = "diagonal"
+        positive_definite = positive_diagonal
+        paths = {"solve": "diagonal", "eigenvalues": "diagonal"}
+    elif upper == 0 or lower == 0:
+        kind = "lower_triangular" if upper == 0 else "upper_triangular"
+        paths = {"solve": "solve_triangular", "eigenvalues": "diagonal"}
+    elif lower + upper < BANDED_FRACTION * n:
+        kind = "banded"
+        paths = {
+            "solve": "solve_banded",
+            "eigenvalues": "eigvals_banded" if symmetric else "eigvals",
+        }
+    elif symmetric:
+        kind = "symmetric"
+        paths = {"solve": "lu", "eigenvalues": "eigvalsh"}
+    else:
+        kind = "general"
+        paths = {"solve": "lu", "eigenvalues": "eigvals"}
+
+    if symmetric and positive_diagonal and kind in ("banded", "symmetric"):
+        positive_definite = None
+
+    if symmetric:
+        # For symmetric A the 2-norm condition number is max|lambda| / min|lambda|
+        paths["condition"] = "eigenvalues"
+    else:
+        paths["condition"] = "svd"
+
+    return {
+        "kind": kind,
+        "symmetric": symmetric,
+        "positive_definite": positive_definite,
+        "lower_bandwidth": lower,
+        "upper_bandwidth": upper,
+        "cholesky": None,
+        "paths": paths,
+    }
+
+
+def factor_cholesky(A, structure):
+    """
+    Decide positive definiteness left open by detect_structure by attempting a
+    Cholesky factorization (banded when the matrix is banded), and record the
+    outcome in structure. On success the factor is kept for later solves, the
+    solve path switches to cho_solve_banded or cho_solve, and a dense symmetric
+    matrix becomes "spd".
+
+    Args:
+    - A: The matrix structure was detected on.
+    - structure: dict returned by detect_structure, updated in place.
+
+    Returns:
+    - True if A is positive definite, False otherwise.
+    """
+    if structure["positive_definite"] is not None:
+        return structure["positive_definite"]
+
+    banded = structure["kind"] == "banded"
+    try:
+        if banded:
+            cholesky = cholesky_banded(
+                banded_storage(A, 0, structure["upper_bandwidth"]),
+                lower=False,
+                check_finite=False,
+            )
+        else:
+            cholesky = cho_factor(A, lower=False, check_finite=False)
+    except LinAlgError:
+        structure["positive_definite"] = False
+        return False
+
+    structure["cholesky"] = cholesky
+    structure["paths"]["solve"] = "cho_solve_banded" if banded else "cho_solve"
+    if not banded:
+        structure["kind"] = "spd"
+    structure["positive_definite"] = True
+    return True
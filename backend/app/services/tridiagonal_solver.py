@@ -0,0 +1,93 @@
+import numpy as np
+
+
+def tridiagonal_diagonals(A):
+    """
+    The sub-, main and super-diagonal of a dense (or stacked dense) matrix, as
+    read-only views without copying.
+
+    Args:
+    - A: Array of shape (..., n, n).
+
+    Returns:
+    - (lower, diagonal, upper) with shapes (..., n - 1), (..., n), (..., n - 1).
+    """
+    A = np.asarray(A)
+    return (
+        np.diagonal(A, -1, axis1=-2, axis2=-1),
+        np.diagonal(A, 0, axis1=-2, axis2=-1),
+        np.diagonal(A, 1, axis1=-2, axis2=-1),
+    )
+
+
+def solve_tridiagonal(lower, diagonal, upper, rhs):
+    """
+    Solve tridiagonal systems with the Thomas algorithm, vectorized across a batch.
+
+    The sweep runs once over the n unknowns; every step updates all systems of the
+    batch together, so k systems of size n cost n vectorized steps instead of k * n
+    Python iterations. Leading axes broadcast, e.g. one set of diagonals of shape (n,)
+    with right-hand sides of shape (k, n) solves one matrix for k right-hand sides.
+    The inputs are never modified: only the n x batch work arrays are allocated.
+
+    There is no pivoting, which is stable for diagonally dominant and symmetric
+    positive definite matrices (e.g. finite-difference Laplacians).
+
+    Args:
+    - lower: Sub-diagonal a_(i+1,i), shape (..., n - 1).
+    - diagonal: Main diagonal a_ii, shape (..., n).
+    - upper: Super-diagonal a_(i,i+1), shape (..., n - 1).
+    - rhs: Right-hand sides, shape (..., n).
+
+    Returns:
+    - The solutions, shape (..., n) with the broadcast batch shape.
+
+    Raises:
+    - ValueError: If the diagonal lengths do not match.
+    - np.linalg.LinAlgError: If a zero pivot occurs in any system of the batch.
+    """
+    lower, diagonal, upper, rhs = (
+        np.asarray(values, dtype=float) for values in (lower, diagonal, upper, rhs)
+    )
+    n = diagonal.shape[-1]
+    m = max(n - 1, 0)  # An empty system has empty off-diagonals
+    if lower.shape[-1] != m or upper.shape[-1] != m or rhs.shape[-1] != n:
+        raise ValueError(
+            f"Expected diagonals of length {m}, {n}, {m} and a right-hand "
+            f"side of length {n}, got {lower.shape[-1]}, {n}, {upper.shape[-1]} "
+            f"and {rhs.shape[-1]}"
+        )
+    batch_shape = np.broadcast_shapes(
+        lower.shape[:-1], diagonal.shape[:-1], upper.shape[:-1], rhs.shape[:-1]
+    )
+    if n == 0:
+        return np.empty(batch_shape + (0,))
+
+    # Views with the unknown index first, so step i reads and writes contiguous rows
+    a, b, c, d = (
+        np.moveaxis(values, -1, 0) for values in (lower, diagonal, upper, rhs)
+    )
+    c_prime = np.empty((n - 1,) + batch_shape)
+    x = np.empty((n,) + batch_shape)
+
+    # Forward sweep: eliminate the sub-diagonal
+    for i in range(n):
+        if i == 0:
+            pivot = b[0]
+            x[0] = d[0]
+        else:
+            pivot = b[i] - a[i - 1] * c_prime[i - 1]
+            x[i] = d[i] - a[i - 1] * x[i - 1]
+        if np.any(pivot == 0):
+            raise np.linalg.LinAlgError(
+                f"Zero pivot in row {i} of a tridiagonal system"
+            )
+        x[i] /= pivot
+        if i < n - 1:
+            c_prime[i] = c[i] / pivot
+
+    # Back substitution
+    for i in range(n - 2, -1, -1):
+        x[i] -= c_prime[i] * x[i + 1]
+
+    return np.moveaxis(x, 0, -1)
@@ -1,28 +1,39 @@
-import pandas as pd
+import io
+import mmap
+import os
+import struct
+
 import numpy as np
 from fastapi import UploadFile
-from io import StringIO
+from scipy import io as scipy_io
+from scipy import sparse
 
+CSV_CHUNK_SIZE = 1 << 20  # Bytes read from a CSV upload at a time
+NPY_MAGIC = b"\x93NUMPY"
+MATRIX_MARKET_MAGIC = b"%%MatrixMarket"
+# Raw uploads start with the number of rows and columns as two little-endian uint64
+RAW_HEADER = struct.Struct("<QQ")
 
-async def read_csv_matrix(file: UploadFile):
-    contents = await file.read()
-    s = str(contents.decode("utf-8"))
-    data = StringIO(s)
-    df = pd.read_csv(data, header=None)
 
-    # Check if all elements are numeric
-    if not df.apply(
-        lambda col: pd.to_numeric(col, errors="coerce").notnull().all()
-    ).all():
-        raise ValueError("All elements in the CSV must be numeric")
+def split_matrix_data(values):
+    """
+    Split an (n + 2) x n array into the matrix A and the vectors b1, b2.
 
-    # Convert to float
-    df = df.astype(float)
+    Args:
+    - values: 2D float array whose last two rows are b1 and b2.
+
+    Returns:
+    - dict with "matrix_A", "vector_b1" and "vector_b2". These are views into `values`.
+    """
+    if values.ndim != 2 or values.shape[0] < 3:
+        raise ValueError(
+            "The upload must contain a square matrix followed by the vectors b1 and b2"
+        )
 
     # Extract matrix and vectors
-    matrix_A = df.iloc[:-2].values  # All rows except last two
-    vector_b1 = df.iloc[-2].values  # Second last row
-    vector_b2 = df.iloc[-1].values  # Last row
+    matrix_A = values[:-2]  # All rows except last two
+    vector_b1 = values[-2]  # Second last row
+    vector_b2 = values[-1]  # Last row
 
     # Check if matrix is square
     if matrix_A.shape[0] != matrix_A.shape[1]:
@@ -37,9 +48,270 @@ async def read_csv_matrix(file: UploadFile):
     return {"matrix_A": matrix_A, "vector_b1": vector_b1, "vector_b2": vector_b2}
 
 
+async def read_csv_array(
+    file: UploadFile, rows_for_cols=None, chunk_size=CSV_CHUNK_SIZE
+):
+    """
+    Parse a numeric CSV upload chunk by chunk into a 2D float64 array.
+
+    Ragged rows and non-numeric or non-finite values are rejected as soon as they
+    are read, without buffering the whole file.
+
+    Args:
+    - file: The uploaded CSV file.
+    - rows_for_cols: Optional function giving the exact number of rows expected for
+      the column count of the first row. When given, the output is preallocated
+      and surplus rows are rejected immediately.
+    - chunk_size: Number of bytes read from the upload at a time.
+
+    Returns:
+    - The parsed rows as a 2D float64 array.
+    """
+    values = None
+    blocks = []
+    n_cols = 0
+    n_rows = 0
+    pending = b""
+
+    while True:
+        chunk = await file.read(chunk_size)
+        lines = (pending + chunk).split(b"\n")
+        # Keep the trailing partial line for the next chunk, unless the upload is done
+        pending = lines.pop() if chunk else b""
+        lines = [line for line in lines if line.strip()]
+
+        if lines:
+            if n_rows == 0:
+                n_cols = lines[0].count(b",") + 1
+                if rows_for_cols is not None:
+                    values = np.empty((rows_for_cols(n_cols), n_cols))
+
+            if values is not None and n_rows + len(lines) > len(values):
+                raise ValueError("The uploaded matrix must be square")
+            for i, line in enumerate(lines, start=n_rows + 1):
+                if line.count(b",") + 1 != n_cols:
+                    raise ValueError(
+                        f"Row {i} has {line.count(b',') + 1} values, expected {n_cols}"
+                    )
+
+            try:
+                parsed = np.array(b",".join(lines).split(b","), dtype=float)
+            except ValueError:
+                raise ValueError("All elements in the CSV must be numeric")
+            # float() also accepts "nan" and "inf", which the results cannot hold
+            if not np.isfinite(parsed).all():
+                raise ValueError("All elements in the CSV must be finite numbers")
+            parsed = parsed.reshape(len(lines), n_cols)
+            if values is not None:
+                values[n_rows : n_rows + len(lines)] = parsed
+            else:
+                blocks.append(parsed)
+            n_rows += len(lines)
+
+        if not chunk:
+            break
+
+    if n_rows == 0:
+        raise ValueError("The uploaded file is empty")
+    if values is None:
+        return np.vstack(blocks)
+    if n_rows != len(values):
+        raise ValueError("The uploaded matrix must be square")
+    return values
+
+
+async def read_csv_matrix(file: UploadFile, chunk_size=CSV_CHUNK_SIZE):
+    """
+    Parse an (n + 2) x n CSV upload chunk by chunk into a preallocated float64 array.
+
+    The column count of the first row fixes n, so the output buffer is allocated
+    once and malformed input (non-numeric or non-finite values, ragged rows, too
+    many rows) is
+    rejected as soon as it is read.
+
+    Returns:
+    - dict with "matrix_A", "vector_b1" and "vector_b2".
+    """
+    values = await read_csv_array(file, lambda n_cols: n_cols + 2, chunk_size)
+    return split_matrix_data(values)
+
+
+def _upload_buffer(file: UploadFile):
+    """
+    Expose the upload's bytes without copying them into Python memory.
+
+    The spooled upload file is memory mapped; if it has no file descriptor
+    the contents are read once instead.
+    """
+    raw = file.file
+    try:
+        fileno = raw.fileno()
+        raw.flush()
+    except (OSError, io.UnsupportedOperation):
+        raw.seek(0)
+        return raw.read()
+
+    if os.fstat(fileno).st_size == 0:
+        return b""
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+def _parse_npy(buffer):
+    header = io.BytesIO(buffer[: min(len(buffer), 65536 + 16)])
+    version = np.lib.format.read_magic(header)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+
+    if dtype.kind not in "fiu":
+        raise ValueError("The .npy array must have a real numeric dtype")
+
+    count = int(np.prod(shape))
+    if len(buffer) - header.tell() < count * dtype.itemsize:
+        raise ValueError("The .npy file is truncated")
+
+    values = np.frombuffer(buffer, dtype=dtype, count=count, offset=header.tell())
+    values = values.reshape(shape, order="F" if fortran_order else "C")
+    # Only non-float64 data is converted; float64 stays a view of the upload
+    return values.astype(np.float64, copy=False)
+
+
+def _parse_raw(buffer):
+    if len(buffer) < RAW_HEADER.size:
+        raise ValueError("Raw uploads must start with a 16-byte (rows, cols) header")
+    rows, cols = RAW_HEADER.unpack_from(buffer)
+
+    if len(buffer) != RAW_HEADER.size + rows * cols * 8:
+        raise ValueError(
+            f"Expected {rows * cols} float64 values after the header for shape ({rows}, {cols})"
+        )
+
+    values = np.frombuffer(buffer, dtype="<f8", count=rows * cols, offset=RAW_HEADER.size)
+    return values.reshape(rows, cols)
+
+
+def read_binary_matrix(file: UploadFile, format=None):
+    """
+    Read an (n + 2) x n upload stored as .npy or as raw little-endian float64.
+
+    Args:
+    - file: The uploaded file.
+    - format: "npy" or "raw". Detected from the .npy magic bytes when omitted.
+
+    Returns:
+    - dict with "matrix_A", "vector_b1" and "vector_b2", all read-only views of the upload.
+    """
+    buffer = _upload_buffer(file)
+    if format is None:
+        format = "npy" if buffer[: len(NPY_MAGIC)] == NPY_MAGIC else "raw"
+
+    if format == "npy":
+        values = _parse_npy(buffer)
+    elif format == "raw":
+        values = _parse_raw(buffer)
+    else:
+        raise ValueError("Invalid format. Must be 'npy' or 'raw'.")
+
+    if not np.isfinite(values).all():
+        raise ValueError("All elements in the upload must be finite numbers")
+
+    return split_matrix_data(values)
+
+
+async def read_rhs_matrix(file: UploadFile):
+    """
+    Read a set of right-hand sides, one per row, from a .npy or CSV upload.
+
+    Returns:
+    - 2D float64 array of shape (k, n).
+    """
+    head = await file.read(len(NPY_MAGIC))
+    await file.seek(0)
+    if head == NPY_MAGIC:
+        values = _parse_npy(_upload_buffer(file))
+    else:
+        values = await read_csv_array(file)
+
+    if values.ndim == 1:
+        values = values.reshape(1, -1)
+    if values.ndim != 2:
+        raise ValueError("Right-hand sides must be a 1D or 2D array")
+    return values
+
+
+async def read_stacked_systems(file: UploadFile):
+    """
+    Read a batch of systems from an .npz upload holding arrays "A" (batch, n, n)
+    and "B" (batch, n, k) or (batch, n).
+
+    Returns:
+    - (A, B) as float64 arrays.
+    """
+    contents = await file.read()
+    try:
+        with np.load(io.BytesIO(contents), allow_pickle=False) as data:
+            return data["A"].astype(float), data["B"].astype(float)
+    except KeyError:
+        raise ValueError("The .npz file must contain arrays named 'A' and 'B'")
+    except (OSError, ValueError):
+        raise ValueError("The upload must be an .npz file with arrays 'A' and 'B'")
+
+
+async def read_sparse_matrix(file: UploadFile, format=None):
+    """
+    Read a square sparse matrix from a Matrix Market (.mtx) file or a triplet CSV
+    with one "row,col,value" line per nonzero (0-based indices, duplicates are
+    summed, the size is the largest index + 1). The matrix is never densified.
+
+    Args:
+    - file: The uploaded file.
+    - format: "mtx" or "triplet". Detected from the Matrix Market banner when omitted.
+
+    Returns:
+    - The matrix as a CSR float64 matrix.
+    """
+    head = await file.read(len(MATRIX_MARKET_MAGIC))
+    await file.seek(0)
+    if format is None:
+        format = "mtx" if head == MATRIX_MARKET_MAGIC else "triplet"
+
+    if format == "mtx":
+        try:
+            matrix = scipy_io.mmread(io.BytesIO(await file.read()))
+        except (ValueError, IndexError) as e:
+            raise ValueError(f"Invalid Matrix Market file: {e}")
+        if not sparse.issparse(matrix):
+            matrix = sparse.csr_matrix(matrix)
+        if np.iscomplexobj(matrix.data):
+            raise ValueError("Complex Matrix Market files are not supported")
+        matrix = sparse.csr_matrix(matrix, dtype=float)
+    elif format == "triplet":
+        triplets = await read_csv_array(file)
+        if triplets.shape[1] != 3:
+            raise ValueError("Triplet CSV rows must be 'row,col,value'")
+        rows, cols, values = triplets.T
+        indices = triplets[:, :2]
+        if (indices < 0).any() or (indices != np.floor(indices)).any():
+            raise ValueError("Row and column indices must be non-negative integers")
+        n = int(indices.max()) + 1
+        matrix = sparse.csr_matrix(
+            (values, (rows.astype(np.int64), cols.astype(np.int64))), shape=(n, n)
+        )
+    else:
+        raise ValueError("Invalid format. Must be 'mtx' or 'triplet'.")
+
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("The uploaded matrix must be square")
+    if not np.isfinite(matrix.data).all():
+        raise ValueError("All elements in the upload must be finite numbers")
+    matrix.sum_duplicates()
+    return matrix
+
+
 def save_matrix_to_file(matrix, filename):
     np.savetxt(filename, matrix, delimiter=",")
 
 
 def read_matrix_from_file(filename):
-    return np.loadtxt(filename, delimiter=",")
\ No newline at end of file
+    return np.loadtxt(filename, delimiter=",")
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from app.services.batched_solver import solve_batched
+
+
+def test_solutions_have_small_residuals():
+    rng = np.random.default_rng(0)
+    A = rng.standard_normal((200, 8, 8)) + 8 * np.eye(8)
+    B = rng.standard_normal((200, 8, 3))
+
+    X, singular, rcond = solve_batched(A, B)
+
+    assert X.shape == B.shape
+    assert not singular.any()
+    assert np.abs(A @ X - B).max() < 1e-12
+
+
+def test_vector_right_hand_sides_keep_their_shape():
+    rng = np.random.default_rng(1)
+    A = rng.standard_normal((5, 4, 4)) + 4 * np.eye(4)
+    b = rng.standard_normal((5, 4))
+
+    X, _, _ = solve_batched(A, b)
+
+    assert X.shape == (5, 4)
+    np.testing.assert_allclose(X, np.linalg.solve(A, b[:, :, np.newaxis])[:, :, 0])
+
+
+def test_rcond_estimate_is_a_close_lower_bound_on_the_inverse_norm():
+    rng = np.random.default_rng(2)
+    A = rng.standard_normal((500, 6, 6))
+    exact = 1.0 / (
+        np.linalg.norm(A, 1, axis=(1, 2))
+        * np.linalg.norm(np.linalg.inv(A), 1, axis=(1, 2))
+    )
+
+    _, _, rcond = solve_batched(A, np.ones((500, 6)))
+
+    # Hager's estimate never exceeds ||A^-1||_1, so rcond never falls below the truth
+    assert np.all(rcond >= exact * (1 - 1e-10))
+    assert np.all(rcond <= 10 * exact)
+
+
+def test_singular_systems_are_flagged_without_failing_the_batch():
+    A = np.stack([np.eye(3), np.zeros((3, 3)), [[1, 2, 3], [2, 4, 6], [0, 0, 1.0]]])
+    B = np.ones((3, 3))
+
+    X, singular, rcond = solve_batched(A, B)
+
+    np.testing.assert_array_equal(singular, [False, True, True])
+    np.testing.assert_allclose(X[0], 1.0)
+    assert np.isnan(X[1:]).all()
+    assert rcond[1] == 0.0
+
+
+def test_empty_systems():
+    X, singular, rcond = solve_batched(np.zeros((3, 0, 0)), np.zeros((3, 0)))
+
+    assert X.shape == (3, 0)
+    assert not singular.any()
+    np.testing.assert_array_equal(rcond, 1.0)
+
+
+def test_mismatched_shapes_are_rejected():
+    with pytest.raises(ValueError):
+        solve_batched(np.zeros((2, 3, 3)), np.zeros((2, 4)))
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app.services import charpoly
+from app.services.charpoly import SLOW_METHOD_LIMIT, characteristic_polynomial
+
+
+@pytest.mark.parametrize("method", ["hessenberg", "berkowitz", "faddeev", "mpmath"])
+def test_methods_agree_with_np_poly(method):
+    if method == "mpmath" and charpoly.mpmath is None:
+        pytest.skip("mpmath is not installed")
+    A = np.random.default_rng(0).standard_normal((6, 6))
+
+    result = characteristic_polynomial(A, method)
+
+    assert result["method"] == method
+    np.testing.assert_allclose(
+        result["coefficients"], np.poly(A).real, rtol=1e-8, atol=1e-10
+    )
+
+
+def test_auto_is_exact_for_small_integer_matrices():
+    A = np.array([[2.0, 1.0, 0.0], [1.0, 3.0, 1.0], [0.0, 1.0, 4.0]])
+
+    result = characteristic_polynomial(A)
+
+    assert result["method"] == "exact"
+    assert result["exact_coefficients"] == ["1", "-9", "24", "-18"]
+
+
+def test_auto_uses_hessenberg_for_float_matrices():
+    result = characteristic_polynomial(np.eye(3) / 3)
+    assert result["method"] == "hessenberg"
+
+
+def test_exact_rejects_non_integer_entries():
+    with pytest.raises(ValueError):
+        characteristic_polynomial(np.eye(2) / 2, "exact")
+
+
+@pytest.mark.parametrize("method", charpoly.SLOW_METHODS)
+def test_slow_methods_are_refused_on_large_matrices(method):
+    n = SLOW_METHOD_LIMIT + 1
+    with pytest.raises(ValueError, match="hessenberg"):
+        characteristic_polynomial(np.eye(n), method)
+
+
+def test_cached_results_are_copies():
+    A = np.diag([1.0, 2.0, 3.0]) + 0.5
+
+    first = characteristic_polynomial(A, "hessenberg")
+    first["coefficients"][:] = 0.0
+    second = characteristic_polynomial(A, "hessenberg")
+
+    np.testing.assert_allclose(second["coefficients"], np.poly(A), atol=1e-12)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from app.services.couette_sweep import couette_sweep, shoot_profiles, sweep_grid
+from app.services.shooting import shoot
+
+
+def test_every_method_meets_the_boundary_conditions():
+    result = couette_sweep([-2.0, 0.0, 2.0, 5.0, 10.0], 0.01)
+
+    for key in ("explicit_euler", "implicit_euler", "finite_difference"):
+        profiles = result[key]
+        assert profiles.shape == (5, 101)
+        np.testing.assert_allclose(profiles[:, 0], 0.0, atol=1e-12)
+        np.testing.assert_allclose(profiles[:, -1], 1.0, atol=1e-12)
+
+
+def test_finite_differences_are_exact_for_the_quadratic_profile():
+    result = couette_sweep([-3.0, 4.0], 0.05, mu=2.0)
+    np.testing.assert_allclose(
+        result["finite_difference"], result["analytical_solution"], atol=1e-12
+    )
+
+
+@pytest.mark.parametrize("integrator", ["explicit", "implicit"])
+def test_batched_superposition_matches_one_shoot_per_forcing(integrator):
+    y, _ = sweep_grid(1.0, 0.02)
+    forcing = np.array([-4.0, 0.0, 3.5])
+
+    u, slopes = shoot_profiles(y, forcing, 1.0, integrator)
+
+    for i, g in enumerate(forcing):
+
+        def rhs(t, position, velocity, g=g):
+            return np.full(np.broadcast(t, position, velocity).shape, g)
+
+        single = shoot(rhs, y, 0.0, 1.0, integrator=integrator)
+        np.testing.assert_allclose(u[i], single["u"], atol=1e-12)
+        assert slopes[i] == pytest.approx(single["slope"])
+
+
+def test_empty_sweep():
+    result = couette_sweep([], 0.1)
+    assert result["explicit_euler"].shape == (0, 11)
+    assert result["finite_difference"].shape == (0, 11)
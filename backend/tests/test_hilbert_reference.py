@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+from scipy.linalg import hilbert, invhilbert
+
+from app.services.hilbert_reference import (
+    HILBERT_CONDITION_TABLE,
+    ONE_NORM_FLOAT_LIMIT,
+    hilbert_condition,
+)
+
+
+def test_table_matches_float_svd_where_that_is_still_accurate():
+    for n in range(1, 9):
+        assert HILBERT_CONDITION_TABLE[n] == pytest.approx(
+            np.linalg.cond(hilbert(n)), rel=1e-6
+        )
+
+
+def test_two_norm_values_come_from_the_table():
+    assert hilbert_condition(3) == 524.0567775860608
+    assert hilbert_condition(10) == 16026286870216.883
+
+
+def test_one_norm_values_are_exact():
+    assert hilbert_condition(3, "1") == 748.0
+    assert hilbert_condition(10, "1") == 35357439251992.0
+    for n in range(1, 12):
+        exact = np.linalg.norm(hilbert(n), 1) * np.linalg.norm(
+            invhilbert(n, exact=True).astype(float), 1
+        )
+        assert hilbert_condition(n, "1") == pytest.approx(exact, rel=1e-12)
+
+
+def test_one_norm_overflows_to_inf_beyond_the_float_range():
+    assert math.isfinite(hilbert_condition(ONE_NORM_FLOAT_LIMIT, "1"))
+    assert hilbert_condition(ONE_NORM_FLOAT_LIMIT + 1, "1") == math.inf
+
+
+def test_large_sizes_grow_monotonically_until_inf():
+    values = [hilbert_condition(n) for n in (20, 50, 150, 300)]
+    assert values == sorted(values)
+    assert hilbert_condition(300) == math.inf
+
+
+def test_sizes_below_one_are_rejected():
+    with pytest.raises(ValueError):
+        hilbert_condition(0)
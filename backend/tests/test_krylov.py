@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from app.services.krylov import krylov_solve, make_preconditioner
+
+
+def poisson_1d(n):
+    return sparse.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n), format="csr")
+
+
+def test_auto_picks_cg_for_spd_and_meets_the_tolerance():
+    A = poisson_1d(200)
+    b = np.ones(200)
+
+    (result,) = krylov_solve(A, b, tol=1e-10)
+
+    assert result["method"] == "cg"
+    assert result["converged"]
+    assert np.linalg.norm(b - A @ result["solution"]) <= 1e-10 * np.linalg.norm(b)
+
+
+def test_auto_picks_gmres_for_nonsymmetric_matrices():
+    A = poisson_1d(50) + sparse.diags([0.5], [1], shape=(50, 50))
+    b = np.arange(50.0)
+
+    (result,) = krylov_solve(A, b, preconditioner="ilu", tol=1e-10)
+
+    assert result["method"] == "gmres"
+    assert result["converged"]
+    np.testing.assert_allclose(A @ result["solution"], b, atol=1e-7)
+
+
+@pytest.mark.parametrize("preconditioner", ["jacobi", "ssor"])
+def test_preconditioners_reduce_cg_iterations(preconditioner):
+    # Badly scaled SPD matrix: diagonal preconditioning removes the scaling
+    scale = sparse.diags(np.logspace(0, 3, 100))
+    A = scale @ poisson_1d(100) @ scale + sparse.eye(100)
+    b = np.ones(100)
+
+    (plain,) = krylov_solve(A, b, method="cg", tol=1e-8, maxiter=5000)
+    (preconditioned,) = krylov_solve(
+        A, b, method="cg", preconditioner=preconditioner, tol=1e-8, maxiter=5000
+    )
+
+    assert preconditioned["converged"]
+    assert preconditioned["iterations"] < plain["iterations"]
+
+
+def test_multiple_right_hand_sides_share_one_call():
+    A = poisson_1d(30)
+    B = np.random.default_rng(0).standard_normal((30, 4))
+
+    results = krylov_solve(A, B, method="bicgstab", preconditioner="jacobi")
+
+    assert len(results) == 4
+    X = np.column_stack([r["solution"] for r in results])
+    np.testing.assert_allclose(A @ X, B, atol=1e-6)
+
+
+def test_cg_rejects_the_nonsymmetric_ilu_preconditioner():
+    with pytest.raises(ValueError):
+        krylov_solve(poisson_1d(10), np.ones(10), method="cg", preconditioner="ilu")
+
+
+def test_jacobi_needs_a_nonzero_diagonal():
+    A = sparse.csr_matrix(np.array([[0.0, 1.0], [1.0, 0.0]]))
+    with pytest.raises(ValueError):
+        make_preconditioner(A, "jacobi")
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from app.services.ode_solver import compile_rhs, integrate_ode
+
+
+def harmonic_oscillator(t, y):
+    return np.array([y[1], -y[0]])
+
+
+def counting(f):
+    calls = []
+
+    def wrapped(t, y):
+        calls.append(t)
+        return f(t, y)
+
+    return wrapped, calls
+
+
+@pytest.mark.parametrize("method", ["dopri5", "rosenbrock"])
+def test_harmonic_oscillator(method):
+    f, calls = counting(harmonic_oscillator)
+
+    result = integrate_ode(f, (0.0, 2 * np.pi), [1.0, 0.0], method, rtol=1e-8)
+
+    assert result["success"]
+    assert result["t"][-1] == pytest.approx(2 * np.pi)
+    t = result["t"]
+    tolerance = 1e-5 if method == "dopri5" else 1e-3
+    np.testing.assert_allclose(result["y"][:, 0], np.cos(t), atol=tolerance)
+    np.testing.assert_allclose(result["y"][:, 1], -np.sin(t), atol=tolerance)
+    assert result["nfev"] == len(calls)
+
+
+def test_dopri5_adapts_the_step_to_the_tolerance():
+    loose = integrate_ode(harmonic_oscillator, (0.0, 10.0), [1.0, 0.0], rtol=1e-3)
+    tight = integrate_ode(harmonic_oscillator, (0.0, 10.0), [1.0, 0.0], rtol=1e-10)
+    assert loose["accepted"] < tight["accepted"]
+
+
+def test_rosenbrock_takes_large_steps_on_a_stiff_problem():
+    # y' = -10^4 (y - cos t): stability limits explicit methods to h ~ 3e-4 here
+    def f(t, y):
+        return -1e4 * (y - np.cos(t))
+
+    stiff = integrate_ode(f, (0.0, 2.0), [0.0], "rosenbrock", rtol=1e-4, atol=1e-6)
+    explicit = integrate_ode(f, (0.0, 2.0), [0.0], "dopri5", rtol=1e-4, atol=1e-6)
+
+    assert stiff["success"] and explicit["success"]
+    assert stiff["y"][-1, 0] == pytest.approx(np.cos(2.0), abs=1e-3)
+    assert stiff["accepted"] < explicit["accepted"] / 10
+
+
+def test_step_limit_is_reported():
+    result = integrate_ode(harmonic_oscillator, (0.0, 100.0), [1.0, 0.0], max_steps=5)
+    assert not result["success"]
+
+
+def test_parameters_must_be_finite():
+    with pytest.raises(ValueError):
+        compile_rhs(["P"], ["u"], {"P": float("inf")})
+
+
+def test_compiled_expressions():
+    f = compile_rhs(["v", "-P / mu"], ["u", "v"], {"P": 2.0, "mu": 4.0})
+    np.testing.assert_allclose(f(0.0, np.array([1.0, 3.0])), [3.0, -0.5])
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["__import__('os')", "u.real", "[u for u in (1,)]", "open('x')", "1e999"],
+)
+def test_compile_rhs_rejects_unsafe_or_invalid_input(expression):
+    with pytest.raises(ValueError):
+        compile_rhs([expression], ["u"])
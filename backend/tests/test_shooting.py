@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from app.services.shooting import is_linear, shoot
+
+
+def test_linear_problems_are_solved_by_superposition():
+    y = np.linspace(0.0, 1.0, 101)
+
+    def f(t, u, v):
+        return -u + t
+
+    result = shoot(f, y, 0.0, 1.0, integrator="rk4")
+
+    assert result["mode"] == "superposition"
+    assert result["integrations"] == 2
+    assert result["converged"]
+    assert result["u"][0] == 0.0
+    assert result["u"][-1] == pytest.approx(1.0, abs=1e-12)
+    # u = t + c sin t solves u'' = -u + t; u(1) = 1 gives c = 0
+    np.testing.assert_allclose(result["u"], y, atol=1e-9)
+
+
+def test_state_independent_euler_matches_the_step_loop():
+    y = np.linspace(0.0, 2.0, 51)
+
+    def f(t, u, v):
+        return np.full(np.broadcast(t, u, v).shape, -3.0)
+
+    fast = shoot(f, y, 1.0, 2.0, state_independent=True)
+    loop = shoot(f, y, 1.0, 2.0)
+
+    np.testing.assert_allclose(fast["u"], loop["u"], atol=1e-12)
+    assert fast["slope"] == pytest.approx(loop["slope"])
+
+
+@pytest.mark.parametrize("mode", ["newton", "secant"])
+def test_nonlinear_problem(mode):
+    # u'' = 1.5 u^2, u(0) = 4, u(1) = 1 has the solution u = 4 / (1 + t)^2
+    y = np.linspace(0.0, 1.0, 201)
+
+    def f(t, u, v):
+        return 1.5 * u**2
+
+    result = shoot(f, y, 4.0, 1.0, integrator="rk4", mode=mode, slope_guess=-7.0)
+
+    assert result["mode"] == mode
+    assert result["converged"]
+    assert result["slope"] == pytest.approx(-8.0, rel=1e-4)
+    np.testing.assert_allclose(result["u"], 4 / (1 + y) ** 2, rtol=1e-5)
+
+
+def test_auto_detects_nonlinear_right_hand_sides():
+    y = np.linspace(0.0, 1.0, 11)
+    assert is_linear(lambda t, u, v: 2 * u - v + np.sin(t), y)
+    assert not is_linear(lambda t, u, v: u * v, y)
+
+
+def test_invalid_mode_is_rejected():
+    with pytest.raises(ValueError):
+        shoot(lambda t, u, v: u, np.linspace(0, 1, 5), 0.0, 1.0, mode="bisection")
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from app.services import structure
+from app.services.matrix_solver import AccurateMatrixSolver
+from app.services.structure import bandwidths, detect_structure, is_symmetric
+
+
+def reference_bandwidths(A):
+    rows, cols = np.nonzero(A)
+    if len(rows) == 0:
+        return 0, 0
+    offsets = cols - rows
+    return int(max(0, -offsets.min())), int(max(0, offsets.max()))
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 300, 600])
+@pytest.mark.parametrize("band", [(0, 0), (1, 0), (0, 2), (3, 1), (None, None)])
+def test_bandwidths_match_the_nonzero_pattern(n, band):
+    rng = np.random.default_rng(n)
+    A = rng.standard_normal((n, n))
+    lower, upper = band
+    if lower is not None:
+        A = np.triu(np.tril(A, upper), -lower)
+
+    assert bandwidths(A) == reference_bandwidths(A)
+
+
+def test_symmetry_is_checked_across_block_boundaries():
+    n = 2 * structure.BLOCK_ROWS + 5
+    A = np.random.default_rng(0).standard_normal((n, n))
+    A = A + A.T
+    assert is_symmetric(A)
+
+    A[-1, 0] += 1e-6
+    assert not is_symmetric(A)
+
+
+def test_symmetry_tolerance_is_relative_to_the_largest_entry():
+    A = np.array([[1e6, 1.0], [1.0 + 1e-9, 1e6]])
+    assert is_symmetric(A)
+    assert is_symmetric(sparse.csr_matrix(A))
+
+
+def test_kinds():
+    tridiagonal = 4 * np.eye(10) - np.eye(10, k=1) - np.eye(10, k=-1)
+    cases = {
+        "diagonal": np.diag([1.0, 2.0, 3.0]),
+        "lower_triangular": np.tril(np.ones((4, 4))),
+        "upper_triangular": np.triu(np.ones((4, 4))),
+        "banded": tridiagonal,
+        "symmetric": np.ones((3, 3)) + np.eye(3),
+        "general": np.arange(9.0).reshape(3, 3),
+    }
+    for kind, A in cases.items():
+        assert detect_structure(A)["kind"] == kind
+
+
+def test_cholesky_is_deferred_to_the_first_solve():
+    A = np.ones((3, 3)) + np.eye(3)
+    solver = AccurateMatrixSolver(A, np.ones(3), np.ones(3))
+
+    report = solver.structure_report()
+    assert report["kind"] == "symmetric"
+    assert report["positive_definite"] is None
+    assert solver.structure()["cholesky"] is None
+
+    x = solver.solve_system(np.ones(3))
+
+    np.testing.assert_allclose(A @ x, 1.0)
+    report = solver.structure_report()
+    assert report["kind"] == "spd"
+    assert report["positive_definite"] is True
+    assert report["paths"]["solve"] == "cho_solve"
+
+
+def test_indefinite_candidates_fall_back_to_lu():
+    A = np.array([[1.0, 2.0, 0.5], [2.0, 1.0, 0.5], [0.5, 0.5, 1.0]])
+    solver = AccurateMatrixSolver(A, np.ones(3), np.ones(3))
+
+    x = solver.solve_system(np.ones(3))
+
+    np.testing.assert_allclose(A @ x, 1.0)
+    assert solver.structure_report()["positive_definite"] is False
+    assert solver.structure_report()["paths"]["solve"] == "lu"
+
+
+def test_banded_spd_determinant_uses_the_banded_factor():
+    A = 4 * np.eye(50) - np.eye(50, k=1) - np.eye(50, k=-1)
+    solver = AccurateMatrixSolver(A, np.ones(50), np.ones(50))
+
+    sign, logabsdet = solver.log_determinant()
+
+    assert solver.structure_report()["paths"]["solve"] == "cho_solve_banded"
+    assert sign == 1.0
+    assert logabsdet == pytest.approx(np.linalg.slogdet(A)[1])
@@ -1,6 +1,8 @@
 
+import math
+
 import numpy as np
-from scipy.linalg import lu, inv, hilbert, eigvals
+from scipy.linalg import lu, inv, hilbert, eigvals, hessenberg
 from numpy.linalg import cond, det, solve, qr
 
 
@@ -21,52 +23,39 @@ def read_matrix_and_vectors(file_name):
 
 
 def is_identity(A,tolerance = 1e-200):
-    """To check if the input matrix is Identity matrix."""
+    """To check if the input matrix is Identity matrix (within the tolerance)."""
     n = A.shape[0]
 
-    for i in range(n):
-        for j in range(n):
-            if i == j :
-                if abs(A[i,j] - 1 > tolerance):
-                    return "Not"
-            else:
-                if abs(A[i,j]  > tolerance):
-                    return "Not"
-                
+    # One vectorized comparison instead of a Python double loop
+    if np.max(np.abs(A - np.eye(n)), initial=0.0) > tolerance:
+        return "Not"
     return "Yes"
 
-    
 
 
 
-def eigenvalues_via_lu(A,max_iterations=10000):
-    """ Finds out the eigenvalues using LU decomposition as per  the method given by Sir"""
 
-    n = A.shape[0]
+def eigenvalues_via_lu(A, max_iterations=10000, tolerance=1e-12):
+    """ Finds out the eigenvalues using LU decomposition as per  the method given by Sir.
+        A = P L U is replaced by (P L)^-1 A (P L) = U P L until P L is the identity,
+        returns the eigenvalues and the number of iterations that were needed."""
+
     iterations = 0
 
     while iterations < max_iterations:
         # LU decomposition using SciPy's built-in method
         P, L, U = lu(A)
-        
-        # Multiply U and L to get the next iteration of A
-        A_next = U @ L
-        
-        if is_identity(L) == "Yes" or is_identity(U) == "Yes" :
-            if is_identity(L) ==  "Yes" :
-                # print(L)
-                eigenvalues = np.diag(U)
-            
-            if is_identity(U) ==  "Yes" :
-                # print(U)
-                eigenvalues = np.diag(U)
+        PL = P @ L
 
+        # Once P L is the identity, A = U is triangular and its diagonal holds the eigenvalues
+        if is_identity(PL, tolerance) == "Yes":
             break
 
-        # Update A for the next iteration
-        A = A_next
+        # Multiply U and P L to get the next (similar) iteration of A
+        A = U @ PL
         iterations += 1
 
+    eigenvalues = np.diag(A)
     return eigenvalues, iterations
 
 
@@ -103,6 +92,148 @@ def eigenvalues_via_qr(A, tolerance=1e-10, max_iterations=1000):
 
 
 
+def householder_vector(x):
+    """Householder vector v and factor beta with (I - beta v v^T) x = -+||x|| e1.
+        Plain Python floats, since it is called for 2- and 3-vectors in a hot loop."""
+
+    x = [float(value) for value in x]
+    norm = math.sqrt(sum(value * value for value in x))
+    if norm == 0:
+        return np.array(x), 0.0
+    x[0] += math.copysign(norm, x[0])
+    return np.array(x), 2.0 / sum(value * value for value in x)
+
+
+
+
+
+def eigenvalues_2x2(a, b, c, d):
+    """Eigenvalues of the 2x2 block [[a, b], [c, d]], complex for a conjugate pair."""
+
+    half_trace = (a + d) / 2
+    discriminant = ((a - d) / 2) ** 2 + b * c
+    root = np.sqrt(complex(discriminant))
+    return half_trace + root, half_trace - root
+
+
+
+
+
+def eigenvalues_via_francis_qr(A, tolerance=1e-14, max_iterations=None):
+    """Finds eigenvalues with the Francis double-shift QR algorithm,
+        returns the eigenvalues and the number of QR sweeps that were needed.
+
+    A is reduced to upper Hessenberg form once (O(n^3)); after that every sweep
+    chases a 3x3 Householder bulge down the active block, costing O(n^2) instead of
+    the O(n^3) of a full QR factorization. The double shift is the pair of
+    eigenvalues of the trailing 2x2 block (Wilkinson/Francis shifts, real arithmetic
+    even for complex pairs), and negligible subdiagonal entries split the problem
+    so converged 1x1 and 2x2 blocks are deflated."""
+
+    H = hessenberg(np.asarray(A, dtype=float))
+    n = H.shape[0]
+    if max_iterations is None:
+        max_iterations = 30 * max(n, 1)
+
+    eigenvalues = np.zeros(n, dtype=complex)
+    iterations = 0
+    since_deflation = 0
+    hi = n - 1
+
+    while hi >= 0:
+        # Zero the negligible subdiagonal entries of the active block (vectorized)
+        diagonal = np.abs(np.diag(H)[: hi + 1])
+        subdiagonal = np.abs(np.diag(H, -1)[:hi])
+        scale = diagonal[:-1] + diagonal[1:]
+        scale[scale == 0] = np.abs(H[: hi + 1, : hi + 1]).max()
+        negligible = np.nonzero(subdiagonal <= tolerance * scale)[0]
+        H[negligible + 1, negligible] = 0.0
+        lo = negligible[-1] + 1 if len(negligible) else 0
+
+        if lo == hi:
+            eigenvalues[hi] = H[hi, hi]
+            hi -= 1
+            since_deflation = 0
+            continue
+        if lo == hi - 1:
+            eigenvalues[hi - 1], eigenvalues[hi] = eigenvalues_2x2(
+                H[hi - 1, hi - 1], H[hi - 1, hi], H[hi, hi - 1], H[hi, hi]
+            )
+            hi -= 2
+            since_deflation = 0
+            continue
+
+        if iterations >= max_iterations:
+            raise np.linalg.LinAlgError(
+                f"Francis QR did not converge in {max_iterations} sweeps"
+            )
+        iterations += 1
+        since_deflation += 1
+
+        # Shifts: s = sum and t = product of the trailing 2x2 eigenvalues, with an
+        # exceptional shift every 10 sweeps without deflation to break cycles
+        if since_deflation % 10 == 0:
+            w = abs(H[hi, hi - 1]) + abs(H[hi - 1, hi - 2])
+            s, t = 1.5 * w, w * w
+        else:
+            s = H[hi - 1, hi - 1] + H[hi, hi]
+            t = H[hi - 1, hi - 1] * H[hi, hi] - H[hi - 1, hi] * H[hi, hi - 1]
+
+        # First column of (H - s1 I)(H - s2 I) = H^2 - s H + t I, which has three nonzeros
+        x = H[lo, lo] * H[lo, lo] + H[lo, lo + 1] * H[lo + 1, lo] - s * H[lo, lo] + t
+        y = H[lo + 1, lo] * (H[lo, lo] + H[lo + 1, lo + 1] - s)
+        z = H[lo + 1, lo] * H[lo + 2, lo + 1]
+
+        # Chase the bulge; only the active block matters for the eigenvalues
+        for k in range(lo, hi - 1):
+            v, beta = householder_vector((x, y, z))
+            if beta:
+                u = beta * v
+                rows = H[k : k + 3, max(lo, k - 1) : hi + 1]
+                rows -= v[:, None] * (u @ rows)
+                cols = H[lo : min(k + 4, hi + 1), k : k + 3]
+                cols -= (cols @ v)[:, None] * u
+            x, y = H[k + 1, k], H[k + 2, k]
+            if k < hi - 2:
+                z = H[k + 3, k]
+
+        v, beta = householder_vector((x, y))
+        if beta:
+            u = beta * v
+            rows = H[hi - 1 : hi + 1, hi - 2 : hi + 1]
+            rows -= v[:, None] * (u @ rows)
+            cols = H[lo : hi + 1, hi - 1 : hi + 1]
+            cols -= (cols @ v)[:, None] * u
+
+    if not eigenvalues.imag.any():
+        eigenvalues = eigenvalues.real
+    return eigenvalues, iterations
+
+
+
+
+
+def compute_eigenvalues(A, method="francis", **options):
+    """Finds eigenvalues with the chosen method and returns (eigenvalues, iterations).
+
+    - "francis": Hessenberg reduction plus Francis double-shift QR (fast, the default).
+    - "qr": unshifted QR iteration on the full matrix (for teaching).
+    - "lu": LU iteration (for teaching).
+    Extra keyword options (tolerance, max_iterations) go to the chosen method."""
+
+    methods = {
+        "francis": eigenvalues_via_francis_qr,
+        "qr": eigenvalues_via_qr,
+        "lu": eigenvalues_via_lu,
+    }
+    if method not in methods:
+        raise ValueError(f"Invalid method. Must be one of {', '.join(methods)}.")
+    return methods[method](A, **options)
+
+
+
+
+
 def power_method(A, num_iterations=1000, tol=1e-9):
     """Finds the largest eigenvalues using the power method."""
 
@@ -163,37 +294,57 @@ def solve_using_lu(A, b):
     return x
 
 
+def thomas_solve(lower, diagonal, upper, rhs):
+    """
+    Solve tridiagonal systems given as compact diagonals with the Thomas algorithm.
+
+    Parameters:
+    lower (numpy array): Sub-diagonal, shape (..., n-1).
+    diagonal (numpy array): Main diagonal, shape (..., n).
+    upper (numpy array): Super-diagonal, shape (..., n-1).
+    rhs (numpy array): Right-hand sides, shape (..., n).
+
+    Leading axes are a batch: the sweep is vectorized over all systems at once.
+    The inputs are never modified.
+
+    Returns:
+    x (numpy array): The solutions, shape (..., n).
+    """
+    a, b, c, d = (np.moveaxis(np.asarray(v, dtype=float), -1, 0) for v in (lower, diagonal, upper, rhs))
+    n = b.shape[0]
+    batch_shape = np.broadcast_shapes(a.shape[1:], b.shape[1:], c.shape[1:], d.shape[1:])
+    if n == 0:
+        return np.empty(batch_shape + (0,))
+    c_prime = np.empty((n - 1,) + batch_shape)
+    x = np.empty((n,) + batch_shape)
+
+    # Forward sweep
+    pivot = b[0]
+    x[0] = d[0] / pivot
+    for i in range(1, n):
+        c_prime[i-1] = c[i-1] / pivot
+        pivot = b[i] - a[i-1] * c_prime[i-1]
+        x[i] = (d[i] - a[i-1] * x[i-1]) / pivot
+
+    # Back substitution
+    for i in range(n-2, -1, -1):
+        x[i] -= c_prime[i] * x[i+1]
+
+    return np.moveaxis(x, 0, -1)
+
+
 def thomas_algorithm(A, rhs):
     """
     Solve a tridiagonal system Ax = rhs using the Thomas algorithm.
     
     Parameters:
-    A (numpy array): The tridiagonal matrix.
+    A (numpy array): The tridiagonal matrix (only its three diagonals are read).
     rhs (numpy array): The right-hand side vector.
     
     Returns:
     x (numpy array): The solution vector.
     """
-    n = len(rhs)
-    c_prime = np.zeros(n-1)
-    d_prime = np.zeros(n)
-    
-    # Forward sweep
-    c_prime[0] = A[0, 1] / A[0, 0]
-    d_prime[0] = rhs[0] / A[0, 0]
-    for i in range(1, n-1):
-        denom = A[i, i] - A[i, i-1] * c_prime[i-1]
-        c_prime[i] = A[i, i+1] / denom
-        d_prime[i] = (rhs[i] - A[i, i-1] * d_prime[i-1]) / denom
-    d_prime[-1] = (rhs[-1] - A[-1, -2] * d_prime[-2]) / (A[-1, -1] - A[-1, -2] * c_prime[-2])
-    
-    # Back substitution
-    x = np.zeros(n)
-    x[-1] = d_prime[-1]
-    for i in range(n-2, -1, -1):
-        x[i] = d_prime[i] - c_prime[i] * x[i+1]
-    
-    return x
+    return thomas_solve(np.diag(A, -1), np.diag(A), np.diag(A, 1), rhs)
 
 
 
@@ -201,6 +352,7 @@ def thomas_algorithm(A, rhs):
 def solve_tridiagonal(A, rhs):
     """
     Solves a tridiagonal matrix system A * u = rhs using forward elimination and back substitution.
+    A and rhs are left unchanged.
 
     Parameters:
     - A: 2D numpy array (N-1, N-1), tridiagonal coefficient matrix.
@@ -209,21 +361,7 @@ def solve_tridiagonal(A, rhs):
     Returns:
     - u_interior: Solution vector for the interior points.
     """
-    N = len(rhs)
-
-    # Forward Elimination to transform A into upper triangular form
-    for i in range(1, N):
-        factor = A[i, i - 1] / A[i - 1, i - 1]
-        A[i, i] -= factor * A[i - 1, i]
-        rhs[i] -= factor * rhs[i - 1]
-
-    # Back Substitution to solve for u_interior
-    u_interior = np.zeros(N)
-    u_interior[-1] = rhs[-1] / A[-1, -1]
-
-    for i in range(N - 2, -1, -1):
-        u_interior[i] = (rhs[i] - A[i, i + 1] * u_interior[i + 1]) / A[i, i]
-
+    u_interior = thomas_solve(np.diag(A, -1), np.diag(A), np.diag(A, 1), rhs)
     return u_interior
 
 
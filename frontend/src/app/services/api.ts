@@ -4,46 +4,61 @@ const API_URL = "http://localhost:8000/api/v1/matrix"; // Adjust this to match y
 
 // const API_URL = "https://numerical-methods-hk3e.onrender.com/api/v1/matrix"; // Adjust this to match your FastAPI server URL
 
+// ID of this client's last uploaded matrix; every request below is sent with it,
+// so concurrent users never operate on each other's uploads
+let matrixId = null;
+
+const withMatrixId = () => {
+  if (matrixId === null) {
+    throw new Error("Please upload a matrix first");
+  }
+  return { params: { matrix_id: matrixId } };
+};
+
 // Upload matrix CSV file
 export const uploadMatrix = async (file) => {
   const formData = new FormData();
   formData.append("file", file);
-  return await axios.post(`${API_URL}/upload`, formData, {
+  const response = await axios.post(`${API_URL}/upload`, formData, {
     headers: { "Content-Type": "multipart/form-data" },
   });
+  if (response.data.matrix_id) {
+    matrixId = response.data.matrix_id;
+  }
+  return response;
 };
 
 // Calculate all operations
 export const calculateAll = async () => {
-  return await axios.get(`${API_URL}/process-all`);
+  return await axios.get(`${API_URL}/process-all`, withMatrixId());
 };
 
 // Calculate determinant
 export const calculateDeterminant = async () => {
-  return await axios.get(`${API_URL}/determinant`);
+  return await axios.get(`${API_URL}/determinant`, withMatrixId());
 };
 
 // Calculate condition number
 export const calculateConditionNumber = async () => {
-  return await axios.get(`${API_URL}/condition-number`);
+  return await axios.get(`${API_URL}/condition-number`, withMatrixId());
 };
 
 // Find solution for Ax=b
 export const findSolution = async (vectorChoice) => {
-  return await axios.post(`${API_URL}/solve/${vectorChoice}`);
+  return await axios.post(`${API_URL}/solve/${vectorChoice}`, null, withMatrixId());
 };
 
 // Compute eigenvalues
 export const computeEigenvalues = async () => {
-  return await axios.get(`${API_URL}/eigenvalues`);
+  return await axios.get(`${API_URL}/eigenvalues`, withMatrixId());
 };
 
 // Get polynomial equation
 export const polynomialEquation = async () => {
-  return await axios.get(`${API_URL}/polynomial-equation`);
+  return await axios.get(`${API_URL}/polynomial-equation`, withMatrixId());
 };
 
 // Use power method to compute eigenvalues
 export const powerMethod = async () => {
-  return await axios.get(`${API_URL}/power-method`);
-};
\ No newline at end of file
+  return await axios.get(`${API_URL}/power-method`, withMatrixId());
+};
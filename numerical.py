@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.optimize import root_scalar
+from scipy.linalg import solve_banded
 
 # Problem parameters
 L = 1.0       # Distance between the walls
@@ -20,29 +21,22 @@ def analytical_solution(P, y, L, U0):
 # Explicit Euler method for solving the ODE system
 def explicit_euler_ivp(y_range, u0, u0_prime, P, mu, dy):
     N = len(y_range)
-    u = np.zeros(N)
-    u_prime = np.zeros(N)
+    # u'' = -P / mu is constant, so the Euler updates are cumulative sums
+    u_prime = u0_prime + dy * (-P / mu) * np.arange(N)
+    u = np.empty(N)
     u[0] = u0
-    u_prime[0] = u0_prime
-
-    for i in range(1, N):
-        u[i] = u[i-1] + dy * u_prime[i-1]
-        u_prime[i] = u_prime[i-1] + dy * (-P / mu)
+    u[1:] = u0 + dy * np.cumsum(u_prime[:-1])
 
     return u
 
 # Implicit Euler method for solving the ODE system
 def implicit_euler_ivp(y_range, u0, u0_prime, P, mu, dy):
     N = len(y_range)
-    u = np.zeros(N)
-    u_prime = np.zeros(N)
+    u_prime = u0_prime + dy * (-P / mu) * np.arange(N)
+    u = np.empty(N)
     u[0] = u0
-    u_prime[0] = u0_prime
-
-    for i in range(1, N):
-        # Iterative step for implicit Euler
-        u_prime[i] = u_prime[i-1] + dy * (-P / mu)
-        u[i] = u[i-1] + dy * u_prime[i]
+    # Implicit step: each u uses the already updated u_prime
+    u[1:] = u0 + dy * np.cumsum(u_prime[1:])
 
     return u
 
@@ -73,23 +67,22 @@ def shooting_method(P, mu, L, U0, dy, method='explicit'):
 
 # Finite Difference method for BVP
 def finite_difference(P, mu, dy, N, U0):
-    A = np.zeros((N, N))
-    b = np.zeros(N)
-
-    # Fill matrix A for interior points
-    for i in range(1, N-1):
-        A[i, i-1] = 1 / dy**2
-        A[i, i] = -2 / dy**2
-        A[i, i+1] = 1 / dy**2
-        b[i] = -P / mu
+    # The system is tridiagonal: store only its three diagonals in banded form
+    # (row 0 upper, row 1 main, row 2 lower diagonal) and solve in O(N)
+    ab = np.zeros((3, N))
+    ab[0, 2:] = 1 / dy**2
+    ab[1, 1:-1] = -2 / dy**2
+    ab[2, :-2] = 1 / dy**2
+    b = np.full(N, -P / mu)
 
     # Boundary conditions
-    A[0, 0] = 1  # u(0) = 0
-    A[-1, -1] = 1
+    ab[1, 0] = 1  # u(0) = 0
+    ab[1, -1] = 1
+    b[0] = 0
     b[-1] = U0  # u(L) = U0
 
     # Solve the system
-    u = np.linalg.solve(A, b)
+    u = solve_banded((1, 1), ab, b)
     return u
 
 # Plotting solutions for different values of P
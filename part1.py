@@ -33,54 +33,32 @@ def compute_jacobian(u, v, P, delta=1e-5):
 # Function to implement the Explicit Euler method for the system of ODEs
 def explicit_euler(y0, v0, step_size, y_end, P):
     n_steps = int(y_end / step_size) + 1
-    y_values = []
-    u_values = []
+    steps = np.arange(n_steps)
 
-    # Initialize values
-    y = 0
-    u = y0
-    v = v0
+    # v' = -P does not depend on the state, so the Euler updates are cumulative sums
+    y_values = steps * step_size
+    v_values = v0 - step_size * P * steps
 
-    for _ in range(n_steps):
-        y_values.append(y)
-        u_values.append(u)
+    # u_(i+1) = u_i + step_size * v_i
+    u_values = np.empty(n_steps)
+    u_values[0] = y0
+    u_values[1:] = y0 + step_size * np.cumsum(v_values[:-1])
 
-        # Update using Explicit Euler method
-        u_new = u + step_size * v
-        v_new = v - step_size * P
-
-        # Update the values
-        u = u_new
-        v = v_new
-        y += step_size
-
-#     return y_values, u_values
+    return y_values, u_values
 
 # Function to implement the Implicit Euler method for the system of ODEs
 def implicit_euler(y0, v0, step_size, y_end, P):
     n_steps = int(y_end / step_size) + 1
-    y_values = []
-    u_values = []
-
-    # Initialize values
-    y = 0
-    u = y0
-    v = v0
-
-    for _ in range(n_steps):
-        y_values.append(y)
-        u_values.append(u)
+    steps = np.arange(n_steps)
 
-        # Implicit Euler update
-        # Solve for v_next first
-        v_next = v - step_size * P
-        # Use v_next to update u_next
-        u_next = u + step_size * v_next
+    # Solve for v_next first: v_(i+1) = v_i - step_size * P
+    y_values = steps * step_size
+    v_values = v0 - step_size * P * steps
 
-        # Update values
-        u = u_next
-        v = v_next
-        y += step_size
+    # Use v_next to update u_next: u_(i+1) = u_i + step_size * v_(i+1)
+    u_values = np.empty(n_steps)
+    u_values[0] = y0
+    u_values[1:] = y0 + step_size * np.cumsum(v_values[1:])
 
     return y_values, u_values
 
@@ -103,7 +81,7 @@ def shooting_method(P, y0, y_end, step_size):
 
 # Function to calculate eigenvalues for both methods
 def calculate_eigenvalues(mat):
-   return eigenvalues_via_qr(mat)
+   return compute_eigenvalues(mat)
 
 # Function to plot the results for a given value of P
 def plot_results(P, y0, y_end, step_size):